@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Headless batch translation.
+
+Reads JSONL records {"text": ..., "source": ..., "target": ...} and writes
+one JSONL result per record:
+
+    {"index": 0, "text": ..., "source": ..., "target": ...,
+     "translation": ..., "error": null}
+
+    python batch.py jobs.jsonl -o results.jsonl --workers 8
+    python batch.py jobs.jsonl -o results.jsonl --resume
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from services.ratelimit import CircuitOpenError
+from services.translate import translate_text
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Translate a JSONL stream of {text, source, target} records.")
+    parser.add_argument('input', nargs='?', default='-', help="input JSONL file ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="output JSONL file ('-' for stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=4, help="translations in flight at once")
+    parser.add_argument('--unordered', action='store_true', help="write results as they finish")
+    parser.add_argument('--start', type=int, default=0, help="skip this many input records")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue after the records already in --output (ordered mode only)")
+    parser.add_argument('--source', default='auto', help="source language for records without one")
+    parser.add_argument('--target', default='en', help="target language for records without one")
+    parser.add_argument('--max-outage', type=float, default=300.0,
+                        help="seconds a record waits out an unavailable service before it fails")
+    return parser.parse_args(argv)
+
+
+def count_lines(path, truncate_partial=False):
+    #complete result lines in `path`; with truncate_partial, a torn last
+    #line (run interrupted mid-write) is cut off so appending starts clean
+    try:
+        with open(path, 'rb+' if truncate_partial else 'rb') as f:
+            count = complete_end = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                complete_end += len(line)
+                if line.strip():
+                    count += 1
+            if truncate_partial:
+                f.truncate(complete_end)
+            return count
+    except FileNotFoundError:
+        return 0
+
+
+def read_records(stream, start, default_source, default_target):
+    #yields (index, record) for non-empty lines; bad lines become records with an error
+    lines = (line for line in stream if line.strip())
+    for index, line in enumerate(lines):
+        if index < start:
+            continue
+        try:
+            record = json.loads(line)
+            yield index, {
+                'text': record['text'],
+                'source': record.get('source') or default_source,
+                'target': record.get('target') or default_target,
+            }
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            yield index, {'text': None, 'source': None, 'target': None, 'error': f"bad record: {e}"}
+
+
+def translate_record(index, record, max_outage=0.0):
+    result = dict(record, index=index, translation=None)
+    if result.get('error'):
+        return result
+    waited = 0.0
+    while True:
+        try:
+            result['translation'] = translate_text(record['text'], record['source'], record['target'])
+            result['error'] = None
+        except CircuitOpenError as e:
+            #the engine already retried; no hurry here, wait for the next probe
+            if waited < max_outage:
+                pause = min(max(e.retry_after, 1.0), max_outage - waited)
+                time.sleep(pause)
+                waited += pause
+                continue
+            result['error'] = f"{type(e).__name__}: {e}"
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        return result
+
+
+def run(records, out, workers, ordered=True, max_outage=0.0):
+    """
+    Translates records with at most `workers` calls in flight and writes
+    results to `out`. Returns (done, failed).
+    """
+    #results are written here, in the calling thread, so a failing `out`
+    #(broken pipe, full disk) raises out of run() instead of dying in a
+    #worker callback; `workers * 2` records read but not written bounds
+    #read-ahead and, in ordered mode, the results held back behind a slow one
+    completed = queue.Queue()
+    order = deque()  # indexes not written yet, in input order
+    finished = {}
+    counts = {'done': 0, 'failed': 0, 'outstanding': 0}
+
+    def write(result):
+        out.write(json.dumps(result, ensure_ascii=False) + '\n')
+        counts['done'] += 1
+        if result['error']:
+            counts['failed'] += 1
+
+    def drain():
+        #waits for one finished record, writes whatever is ready
+        result = completed.get().result()
+        counts['outstanding'] -= 1
+        if ordered:
+            finished[result['index']] = result
+            while order and order[0] in finished:
+                write(finished.pop(order.popleft()))
+        else:
+            write(result)
+        out.flush()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            for index, record in records:
+                while counts['outstanding'] >= workers * 2:
+                    drain()
+                order.append(index)
+                counts['outstanding'] += 1
+                pool.submit(translate_record, index, record, max_outage).add_done_callback(completed.put)
+            while counts['outstanding']:
+                drain()
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return counts['done'], counts['failed']
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.resume and args.unordered:
+        sys.exit("--resume needs ordered output")
+    if args.resume and args.output == '-':
+        sys.exit("--resume needs --output")
+
+    start = args.start
+    if args.resume:
+        start += count_lines(args.output, truncate_partial=True)
+
+    src = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    mode = 'a' if args.resume else 'w'
+    out = sys.stdout if args.output == '-' else open(args.output, mode, encoding='utf-8')
+    try:
+        records = read_records(src, start, args.source, args.target)
+        done, failed = run(records, out, max(1, args.workers), ordered=not args.unordered,
+                           max_outage=args.max_outage)
+    except BrokenPipeError:
+        #reader went away (| head); keep the interpreter from flushing into it again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    except OSError as e:
+        sys.exit(f"Failed to write results: {e}")
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"translated {done - failed}, failed {failed}", file=sys.stderr)
+    from services.engine import get_engine
+    from services.telemetry import telemetry
+    print("engine: " + ", ".join(f"{k} {v}" for k, v in get_engine().stats().items()), file=sys.stderr)
+    telemetry.close()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# benchmarks/latency_bench.py
+"""
+End-to-end translation latency against a local mock backend.
+
+Starts benchmarks.mock_backend in-process and points the shared
+translation engine at it (TRANSLATOR_BACKEND_URL), then measures:
+
+  gui    - the real TranslatorApp, headless (offscreen Qt): phrases are
+           typed key by key into the source box; reports keystroke-to-result
+           time (last key -> matching text in the target box), backend
+           requests per typed character and phrases per second. Every
+           round types the same phrases, so round 2+ shows the cache.
+  batch  - batch.run() over generated records at several worker counts;
+           reports records per second and requests made.
+
+    python -m benchmarks.latency_bench -o latency_bench.json
+    python -m benchmarks.latency_bench --latency 300 --jitter 100 --error-rate 0.05 --cps 8
+
+The app runs in a temporary working directory, so history and the TTS
+cache of the real profile are not touched.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.mock_backend import MockBackend, add_backend_args, mock_translation
+from services.debounce import percentile
+
+PHRASES = [
+    "Good morning",
+    "Where is the train station?",
+    "I would like a cup of coffee, please.",
+    "The weather is nice today",
+    "How much does this cost?",
+    "Could you speak a little slower?",
+    "We are meeting at seven in the evening.",
+    "Thank you very much for your help",
+]
+
+
+def summarize(values):
+    if not values:
+        return None
+    return {
+        'count': len(values),
+        'p50_ms': round(percentile(values, 50), 2),
+        'p90_ms': round(percentile(values, 90), 2),
+        'p99_ms': round(percentile(values, 99), 2),
+        'max_ms': round(max(values), 2),
+    }
+
+
+def wait(ms):
+    #runs the Qt event loop for `ms`, letting worker threads run in between
+    #(QTest.qWait keeps the GIL and stalls them)
+    from PySide6.QtCore import QEventLoop
+    from PySide6.QtWidgets import QApplication
+    deadline = time.perf_counter() + ms / 1000
+    while time.perf_counter() < deadline:
+        QApplication.processEvents(QEventLoop.AllEvents, 5)
+        time.sleep(0.001)
+
+
+class ResultWatcher:
+    #records when the target box first shows the expected text
+    def __init__(self, target_text):
+        self.target_text = target_text
+        self.expected = None
+        self.arrived_at = None
+        target_text.textChanged.connect(self._on_changed)
+
+    def expect(self, text):
+        self.expected = text
+        self.arrived_at = None
+
+    def _on_changed(self):
+        if self.arrived_at is None and self.target_text.toPlainText() == self.expected:
+            self.arrived_at = time.perf_counter()
+
+
+def run_gui(backend, phrases, rounds, cps, timeout, rng):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PySide6.QtGui import QTextCursor
+    from PySide6.QtWidgets import QApplication
+    from ui.main_window import TranslatorApp
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = TranslatorApp()
+    window.tts_prefetch_enabled = False  # no gTTS traffic
+    window.source_lang_code, window.target_lang_code = 'en', 'ru'
+    window.show()
+    watcher = ResultWatcher(window.target_text)
+    editor = window.source_text
+
+    results = []
+    for round_no in range(1, rounds + 1):
+        latencies, typed, timeouts = [], 0, 0
+        requests_before = backend.stats()['requests']
+        started = time.perf_counter()
+        for phrase in phrases:
+            editor.clear()
+            wait(50)
+            watcher.expect(mock_translation(phrase.strip()))
+            for ch in phrase:
+                editor.moveCursor(QTextCursor.End)
+                editor.insertPlainText(ch)
+                typed += 1
+                #typing speed with some human unevenness
+                wait(max(10, int(rng.gauss(1000 / cps, 300 / cps))))
+            last_key = time.perf_counter()
+            deadline = last_key + timeout
+            while watcher.arrived_at is None and time.perf_counter() < deadline:
+                wait(2)
+            if watcher.arrived_at is None:
+                timeouts += 1
+            else:
+                latencies.append((watcher.arrived_at - last_key) * 1000)
+        elapsed = time.perf_counter() - started
+        requests = backend.stats()['requests'] - requests_before
+        results.append({
+            'round': round_no,
+            'keystroke_to_result': summarize(latencies),
+            'timeouts': timeouts,
+            'chars_typed': typed,
+            'requests': requests,
+            'requests_per_char': round(requests / typed, 4) if typed else None,
+            'phrases_per_s': round(len(latencies) / elapsed, 3),
+            'debounce_ms': window.debounce.interval(),
+        })
+        p50 = percentile(latencies, 50) if latencies else float('nan')
+        print(f"gui round {round_no}: p50 {p50:.0f} ms, {requests} requests for {typed} chars", file=sys.stderr)
+
+    window.close()
+    app.processEvents()
+    return results
+
+
+def run_batch(backend, phrases, records, worker_counts):
+    import batch
+
+    results = []
+    for workers in worker_counts:
+        jobs = ((i, {'text': f"{phrases[i % len(phrases)]} #{i}", 'source': 'en', 'target': 'ru'})
+                for i in range(records))
+        requests_before = backend.stats()['requests']
+        started = time.perf_counter()
+        done, failed = batch.run(jobs, io.StringIO(), workers)
+        elapsed = time.perf_counter() - started
+        results.append({
+            'workers': workers,
+            'records': done,
+            'failed': failed,
+            'elapsed_s': round(elapsed, 3),
+            'records_per_s': round(done / elapsed, 2),
+            'requests': backend.stats()['requests'] - requests_before,
+        })
+        print(f"batch x{workers}: {results[-1]['records_per_s']} records/s, {failed} failed", file=sys.stderr)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end translation latency against a mock backend.")
+    add_backend_args(parser)
+    parser.add_argument('--paths', nargs='+', default=['gui', 'batch'], choices=['gui', 'batch'])
+    parser.add_argument('--phrases', help="file with one phrase per line (default: built-in set)")
+    parser.add_argument('--rounds', type=int, default=2, help="times the gui types the phrase set")
+    parser.add_argument('--cps', type=float, default=6.0, help="typing speed, characters per second")
+    parser.add_argument('--timeout', type=float, default=10.0, help="seconds to wait for a gui result")
+    parser.add_argument('--records', type=int, default=200, help="records per batch run")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8], help="batch worker counts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='latency_bench.json')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    phrases = PHRASES
+    if args.phrases:
+        with open(args.phrases, encoding='utf-8') as f:
+            phrases = [line.strip() for line in f if line.strip()]
+    output = os.path.abspath(args.output)
+
+    backend = MockBackend(latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate,
+                          error_status=args.error_status, seed=args.seed).start()
+    #before the engine is created
+    os.environ['TRANSLATOR_BACKEND_URL'] = backend.url
+    os.environ.setdefault('TRANSLATOR_STORAGE', 'log')
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'backend': {'latency_ms': args.latency, 'jitter_ms': args.jitter,
+                        'error_rate': args.error_rate, 'error_status': args.error_status},
+            'cps': args.cps,
+            'phrases': len(phrases),
+        },
+    }
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            if 'gui' in args.paths:
+                report['gui'] = run_gui(backend, phrases, args.rounds, args.cps, args.timeout,
+                                        random.Random(args.seed))
+            if 'batch' in args.paths:
+                report['batch'] = run_batch(backend, phrases, args.records, args.workers)
+        finally:
+            os.chdir(cwd)
+            report['backend_totals'] = backend.stats()
+            backend.stop()
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"written {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
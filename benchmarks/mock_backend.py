@@ -0,0 +1,131 @@
+# benchmarks/mock_backend.py
+"""
+Local stand-in for the translation backend.
+
+Answers the engine's GET ?sl=..&tl=..&q=.. with the same result markup
+Google's mobile page uses, after a configurable latency (+- jitter), and
+fails a configurable share of requests. The "translation" is the text
+upper-cased, so callers can tell which input a result belongs to.
+
+    python -m benchmarks.mock_backend --port 8765 --latency 150 --jitter 50 --error-rate 0.02
+    TRANSLATOR_BACKEND_URL=http://127.0.0.1:8765/m python main.py
+"""
+import argparse
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def mock_translation(text):
+    return text.upper()
+
+
+class MockBackend:
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=150.0, jitter_ms=50.0,
+                 error_rate=0.0, error_status=500, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.chars = 0
+
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, like the real service
+
+            def do_GET(self):
+                backend._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/m"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='mock-backend', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def stats(self):
+        with self._lock:
+            return {'requests': self.requests, 'errors': self.errors, 'chars': self.chars}
+
+    def _draw(self):
+        #(delay in seconds, failed?) for one request
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            failed = self._rng.random() < self.error_rate
+        return max(0.0, self.latency_ms + jitter) / 1000, failed
+
+    def _handle(self, request):
+        query = parse_qs(urlparse(request.path).query)
+        text = query.get('q', [''])[0]
+        delay, failed = self._draw()
+        with self._lock:
+            self.requests += 1
+            self.chars += len(text)
+            if failed:
+                self.errors += 1
+        time.sleep(delay)
+
+        if failed:
+            status, body = self.error_status, b'error'
+        else:
+            status = 200
+            body = (f'<html><body><div class="result-container">'
+                    f'{html.escape(mock_translation(text))}</div></body></html>').encode('utf-8')
+        request.send_response(status)
+        request.send_header('Content-Type', 'text/html; charset=utf-8')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+
+def add_backend_args(parser):
+    parser.add_argument('--latency', type=float, default=150.0, help="mean response time, ms")
+    parser.add_argument('--jitter', type=float, default=50.0, help="+- uniform jitter, ms")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of requests that fail (0..1)")
+    parser.add_argument('--error-status', type=int, default=500, help="HTTP status of failed requests")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in translation backend.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_backend_args(parser)
+    args = parser.parse_args(argv)
+
+    backend = MockBackend(args.host, args.port, args.latency, args.jitter,
+                          args.error_rate, args.error_status).start()
+    print(f"mock backend on {backend.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backend.stop()
+        print(backend.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# benchmarks/storage_bench.py
+"""
+TranslationsStorage benchmarks on synthetic histories.
+
+Runs save_translation, get_translations, get_page, delete_translation and
+clear_translations for every backend against histories of 1k..1M entries
+and writes latency percentiles, bytes written per operation and peak RSS
+as JSON, so runs can be compared.
+
+    python -m benchmarks.storage_bench -o storage_bench.json
+    python -m benchmarks.storage_bench --backends log sqlite --sizes 1000 100000
+
+Every (backend, size) pair runs in its own subprocess so peak RSS is
+per pair. Each operation stops after --ops calls or --budget seconds,
+whichever comes first (the json backend at 1M entries is very slow).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from services.debounce import percentile
+from services.storage import STORAGE_BACKENDS, open_storage
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+FILE_NAMES = {'json': 'translations.json', 'log': 'translations.jsonl', 'sqlite': 'translations.db'}
+
+_WORDS = ("hello world translation history storage benchmark entry text language "
+          "quick brown fox jumps over lazy dog").split()
+
+
+def synthetic_entry(i, rng):
+    source = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(2, 12)))
+    return {
+        'timestamp': time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(1_700_000_000 + i)),
+        'source_text': source,
+        'translated_text': source.upper(),
+        'source_lang': 'en',
+        'target_lang': rng.choice(('ru', 'de', 'fr')),
+    }
+
+
+def prefill(backend, storage, size, rng):
+    #writes `size` entries in bulk, in the backend's own format (oldest first)
+    entries = (synthetic_entry(i, rng) for i in range(size))
+    if backend == 'json':
+        storage._save_translations(list(entries)[::-1])
+    elif backend == 'log':
+        import uuid
+        with open(storage.file_path, 'ab') as f:
+            for entry in entries:
+                entry['id'] = uuid.uuid4().hex
+                f.write(storage._encode(entry))
+    elif backend == 'sqlite':
+        with storage._conn:
+            storage._conn.executemany(storage._INSERT, (
+                (e['timestamp'], e['source_text'], e['translated_text'], e['source_lang'], e['target_lang'])
+                for e in entries
+            ))
+    else:
+        raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def bytes_written():
+    #bytes passed to write() by this process (linux), else None
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('wchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None  # windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def dir_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def measure(call, max_ops, budget, workdir):
+    latencies = []
+    io_before, size_before = bytes_written(), dir_size(workdir)
+    deadline = time.perf_counter() + budget
+    while len(latencies) < max_ops and time.perf_counter() < deadline:
+        start = time.perf_counter()
+        call(len(latencies))
+        latencies.append((time.perf_counter() - start) * 1000)
+    io_after = bytes_written()
+    if io_before is not None and io_after is not None:
+        written = io_after - io_before
+    else:
+        written = max(0, dir_size(workdir) - size_before)  # growth only
+    count = len(latencies)
+    return {
+        'count': count,
+        'p50_ms': round(percentile(latencies, 50), 4),
+        'p90_ms': round(percentile(latencies, 90), 4),
+        'p99_ms': round(percentile(latencies, 99), 4),
+        'max_ms': round(max(latencies), 4),
+        'bytes_per_op': round(written / count) if count else None,
+    }
+
+
+def run_single(backend, size, max_ops, budget, seed=0):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, FILE_NAMES[backend])
+        kwargs = {'file_path': path}
+        if backend != 'json':
+            kwargs['legacy_path'] = None
+        storage = open_storage(backend, **kwargs)
+
+        start = time.perf_counter()
+        prefill(backend, storage, size, rng)
+        prefill_s = time.perf_counter() - start
+        if backend == 'log':
+            storage.close()
+            storage = open_storage(backend, **kwargs)
+
+        ops = {}
+        ops['get_translations'] = measure(
+            lambda i: storage.get_translations(50), max_ops, budget, workdir)
+
+        #walks history page by page, starting over at the end
+        cursor = {'next': None}
+        def next_page(i):
+            _, cursor['next'] = storage.get_page(cursor['next'], 50)
+        ops['get_page'] = measure(next_page, max_ops, budget, workdir)
+
+        ops['save_translation'] = measure(
+            lambda i: storage.save_translation(f"bench {i}", f"BENCH {i}", 'en', 'ru'),
+            max_ops, budget, workdir)
+        ops['delete_translation'] = measure(
+            lambda i: storage.delete_translation(rng.randrange(50)), max_ops, budget, workdir)
+        ops['clear_translations'] = measure(
+            lambda i: storage.clear_translations(), 1, budget, workdir)
+        storage.close()
+
+    return {
+        'backend': backend,
+        'size': size,
+        'prefill_s': round(prefill_s, 3),
+        'ops': ops,
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark TranslationsStorage backends.")
+    parser.add_argument('--backends', nargs='+', default=sorted(STORAGE_BACKENDS), choices=sorted(STORAGE_BACKENDS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument('--ops', type=int, default=200, help="max calls per operation")
+    parser.add_argument('--budget', type=float, default=20.0, help="max seconds per operation")
+    parser.add_argument('-o', '--output', default='storage_bench.json')
+    parser.add_argument('--single', nargs=2, metavar=('BACKEND', 'SIZE'), help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.single:
+        #child process: one pair, result on stdout
+        backend, size = args.single[0], int(args.single[1])
+        print(json.dumps(run_single(backend, size, args.ops, args.budget)))
+        return
+
+    results = []
+    for size in args.sizes:
+        for backend in args.backends:
+            print(f"{backend:>6} {size:>9,} ...", file=sys.stderr, end=' ', flush=True)
+            child = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.storage_bench', '--single', backend, str(size),
+                 '--ops', str(args.ops), '--budget', str(args.budget)],
+                capture_output=True, text=True,
+            )
+            if child.returncode != 0:
+                print("failed", file=sys.stderr)
+                results.append({'backend': backend, 'size': size, 'error': child.stderr.strip()[-2000:]})
+                continue
+            result = json.loads(child.stdout)
+            results.append(result)
+            save = result['ops']['save_translation']
+            print(f"save p50 {save['p50_ms']} ms, {save['bytes_per_op']} B/op, "
+                  f"rss {result['peak_rss_kb']} KB", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'ops': args.ops,
+            'budget_s': args.budget,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"written {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,8 @@ UI_TRANSLATIONS = {
         'translation_error': 'Ошибка перевода: {}',
         'playback_error': 'Ошибка воспроизведения: {}',
         'playback_started': 'Воспроизведение...',
+        'playback_stopped': 'Воспроизведение остановлено',
+        'playback_finished': 'Воспроизведение завершено',
         'delete_confirmation': 'Вы уверены, что хотите удалить эту запись?',
         'clear_confirmation': 'Вы уверены, что хотите очистить всю историю переводов?',
         'yes': 'Да',
@@ -31,6 +33,18 @@ UI_TRANSLATIONS = {
         'language_detection_message': 'Определен язык: {}. Хотите использовать его для перевода?',
         'language_not_supported': 'Определенный язык не поддерживается переводчиком',
         'language_detection_failed': 'Не удалось определить язык текста',
+        'language_detected': 'Определен язык: {}',
+        'auto_detect': 'Определить язык',
+        'from_memory': 'Из памяти переводов',
+        'from_memory_fuzzy': 'Из памяти переводов (совпадение {}%)',
+        'multi_target': 'Несколько языков',
+        'multi_target_title': 'Перевод на несколько языков',
+        'multi_target_empty': 'Отметьте языки слева',
+        'translate': 'Перевести',
+        'translating': 'Перевод...',
+        'service_unavailable': 'Сервис перевода недоступен, повтор через {} с',
+        'telemetry_translation': 'Перевод: p50 {} мс, p95 {} мс, без сети {}%',
+        'telemetry_tts': 'Озвучка: p50 {} мс, p95 {} мс, из кэша {}%',
         'invalid_language': 'Неверный язык',
         'no_history': 'Нет данных',
         'no_text': 'Нет текста для озвучивания',
@@ -54,6 +68,8 @@ UI_TRANSLATIONS = {
         'translation_error': 'Translation error: {}',
         'playback_error': 'Playback error: {}',
         'playback_started': 'Playing...',
+        'playback_stopped': 'Playback stopped',
+        'playback_finished': 'Playback finished',
         'delete_confirmation': 'Are you sure you want to delete this entry?',
         'clear_confirmation': 'Are you sure you want to clear all translation history?',
         'yes': 'Yes',
@@ -64,6 +80,18 @@ UI_TRANSLATIONS = {
         'language_detection_message': 'Detected language: {}. Would you like to use it for translation?',
         'language_not_supported': 'The detected language is not supported by the translator',
         'language_detection_failed': 'Could not detect the language of the text',
+        'language_detected': 'Detected language: {}',
+        'auto_detect': 'Detect language',
+        'from_memory': 'From translation memory',
+        'from_memory_fuzzy': 'From translation memory ({}% match)',
+        'multi_target': 'Several languages',
+        'multi_target_title': 'Translate into several languages',
+        'multi_target_empty': 'Tick languages on the left',
+        'translate': 'Translate',
+        'translating': 'Translating...',
+        'service_unavailable': 'Translation service unavailable, retrying in {} s',
+        'telemetry_translation': 'Translation: p50 {} ms, p95 {} ms, offline hits {}%',
+        'telemetry_tts': 'Speech: p50 {} ms, p95 {} ms, cached {}%',
         'invalid_language': 'Invalid language',
         'no_history': 'No data',
         'no_text': 'No text to speak',
@@ -184,4 +212,26 @@ LANGUAGES = {
     'yi': {'ru': 'Идиш', 'en': 'Yiddish'},
     'yo': {'ru': 'Йоруба', 'en': 'Yoruba'},
     'zu': {'ru': 'Зулу', 'en': 'Zulu'},
-}
\ No newline at end of file
+}
+
+# ------------------------------------------------------
+# Языки озвучки: снимок gtts.lang.tts_langs() (gTTS 2.5.4),
+# чтобы не импортировать gtts при запуске
+# ------------------------------------------------------
+TTS_LANGUAGES = frozenset({
+    'af', 'am', 'ar', 'bg', 'bn', 'bs', 'ca', 'cs', 'cy', 'da', 'de', 'el',
+    'en', 'es', 'et', 'eu', 'fi', 'fr', 'fr-CA', 'gl', 'gu', 'ha', 'hi',
+    'hr', 'hu', 'id', 'is', 'it', 'iw', 'ja', 'jw', 'km', 'kn', 'ko', 'la',
+    'lt', 'lv', 'ml', 'mr', 'ms', 'my', 'ne', 'nl', 'no', 'pa', 'pl', 'pt',
+    'pt-PT', 'ro', 'ru', 'si', 'sk', 'sq', 'sr', 'su', 'sv', 'sw', 'ta',
+    'te', 'th', 'tl', 'tr', 'uk', 'ur', 'vi', 'yue', 'zh', 'zh-CN', 'zh-TW'
+})
+
+# source language value: detect it locally from the text
+AUTO_DETECT = 'auto'
+
+
+def language_name(code, interface_lang):
+    if code == AUTO_DETECT:
+        return UI_TRANSLATIONS[interface_lang]['auto_detect']
+    return LANGUAGES.get(code, {}).get(interface_lang, code)
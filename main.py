@@ -1,12 +1,35 @@
 # -*- coding: utf-8 -*-
 import sys
-from PySide6.QtWidgets import QApplication
-from ui.main_window import TranslatorApp
+
+from services.profiler import startup
+
+with startup.phase('import PySide6'):
+    from PySide6.QtCore import QObject, QEvent
+    from PySide6.QtWidgets import QApplication
+with startup.phase('import ui.main_window'):
+    from ui.main_window import TranslatorApp
+
+
+class FirstPaintWatcher(QObject):
+    #marks the first paint of the window and writes the startup report
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            startup.mark('first_paint')
+            startup.write()
+        return False
+
 
 def main():
-    app = QApplication(sys.argv)
-    window = TranslatorApp()
-    window.show()
+    with startup.phase('QApplication'):
+        app = QApplication(sys.argv)
+    with startup.phase('TranslatorApp.__init__'):
+        window = TranslatorApp()
+    if startup.enabled:
+        watcher = FirstPaintWatcher(window)
+        window.installEventFilter(watcher)
+    with startup.phase('show'):
+        window.show()
     sys.exit(app.exec())
 
 if __name__ == "__main__":
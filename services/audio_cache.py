@@ -0,0 +1,83 @@
+# services/audio_cache.py
+
+import hashlib
+import json
+import os
+import tempfile
+from threading import Lock
+
+
+class AudioCache:
+    """
+    On-disk cache of synthesized speech, content-addressed by
+    hash(text, lang, tts options). Files are written atomically (temp file +
+    rename) and the least recently used ones are evicted once the total
+    size goes over max_bytes; a file's mtime is its last use.
+    """
+
+    SUFFIX = '.mp3'
+
+    def __init__(self, directory='tts_cache', max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total = sum(size for _, size, _ in self._scan())
+
+    @staticmethod
+    def make_key(text, lang, **options):
+        payload = json.dumps([text, lang, options], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key):
+        #path of the cached file or None; marks it as recently used
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, key, data):
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            with self._lock:
+                old_size = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(tmp_path, path)
+                self._total += len(data) - old_size
+                self._evict(keep=path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    def _scan(self):
+        #(path, size, mtime) of cached files
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                stat = entry.stat()
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self, keep=None):
+        if self._total <= self.max_bytes:
+            return
+        for path, size, _ in sorted(self._scan(), key=lambda item: item[2]):
+            if self._total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                self._total -= size
+            except OSError:
+                pass  # in use (e.g. being played) - try the next one
+
+    def total_bytes(self):
+        return self._total
@@ -0,0 +1,86 @@
+# services/cache.py
+
+from collections import OrderedDict
+from threading import Lock
+
+
+def normalize_text(text):
+    #collapse whitespace so retyped/reformatted text hits the same entry
+    return " ".join(text.split())
+
+
+class TranslationCache:
+    """
+    Bounded LRU cache of finished translations.
+    Keyed on (normalized text, source lang, target lang); limited both by
+    number of entries and by the approximate size of stored strings.
+    """
+
+    def __init__(self, max_entries=500, max_bytes=2 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    @staticmethod
+    def make_key(text, source_lang, target_lang):
+        return (normalize_text(text), source_lang, target_lang)
+
+    @staticmethod
+    def _entry_size(key, value):
+        return len(key[0].encode('utf-8')) + len(value.encode('utf-8'))
+
+    def get(self, text, source_lang, target_lang):
+        key = self.make_key(text, source_lang, target_lang)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, text, source_lang, target_lang, translated_text):
+        key = self.make_key(text, source_lang, target_lang)
+        if not key[0] or not translated_text:
+            return
+        size = self._entry_size(key, translated_text)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= self._entry_size(key, old)
+            self._entries[key] = translated_text
+            self._bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            key, value = self._entries.popitem(last=False)
+            self._bytes -= self._entry_size(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,65 @@
+# services/debounce.py
+
+import time
+from collections import deque
+
+
+def percentile(values, q):
+    #nearest-rank percentile, q in [0, 100]
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1))))
+    return ordered[rank]
+
+
+class AdaptiveDebounce:
+    """
+    Live translation delay tuned from how the user types and how fast the
+    backend answers.
+
+    The delay sits just above the user's usual pause between keystrokes, so
+    a request is not fired mid-word, plus a share of the backend's median
+    latency - when answers are slow, firing often only piles up requests
+    that will be stale on arrival. The result is clamped to [min_ms, max_ms].
+    """
+
+    TYPING_GAP_FACTOR = 1.5
+    LATENCY_FACTOR = 0.25
+    MAX_TYPING_GAP_MS = 2000  # longer pauses are not typing rhythm
+
+    def __init__(self, min_ms=250, max_ms=1200, default_ms=500, window=40):
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.default_ms = default_ms
+        self._gaps = deque(maxlen=window)
+        self._latencies = deque(maxlen=window)
+        self._last_keystroke = None
+
+    def keystroke(self, now=None):
+        now = time.monotonic() if now is None else now
+        if self._last_keystroke is not None:
+            gap_ms = (now - self._last_keystroke) * 1000
+            if gap_ms <= self.MAX_TYPING_GAP_MS:
+                self._gaps.append(gap_ms)
+        self._last_keystroke = now
+
+    def latency(self, ms):
+        self._latencies.append(ms)
+
+    def latency_percentiles(self):
+        return percentile(self._latencies, 50), percentile(self._latencies, 95)
+
+    def interval(self):
+        gap = percentile(self._gaps, 90)
+        if gap is None:
+            delay = self.default_ms
+        else:
+            delay = self.TYPING_GAP_FACTOR * gap
+        p50, p95 = self.latency_percentiles()
+        if p50 is not None:
+            delay += self.LATENCY_FACTOR * p50
+            #tail latency above the cap: don't stack requests faster than we get answers
+            if p95 > self.max_ms:
+                delay = max(delay, self.max_ms)
+        return int(max(self.min_ms, min(self.max_ms, delay)))
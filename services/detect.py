@@ -0,0 +1,84 @@
+# services/detect.py
+
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+
+from constants import AUTO_DETECT
+from services.cache import normalize_text
+
+_factory_lock = Lock()
+_factory_ready = False
+
+
+def _load_profiles():
+    #langdetect keeps its language profiles in a module-level factory;
+    #load them once, on first use, for every detector in the process
+    global _factory_ready
+    with _factory_lock:
+        if not _factory_ready:
+            from langdetect import DetectorFactory
+            from langdetect.detector_factory import init_factory
+            init_factory()
+            DetectorFactory.seed = 0  # same text -> same answer
+            _factory_ready = True
+
+
+class LanguageDetector:
+    """
+    Offline source-language detection (langdetect), no network round-trip.
+    Results are memoized per text hash. Inputs shorter than MIN_CHARS, or
+    detections below MIN_PROBABILITY, fall back to the last confirmed
+    language, or give None (leave it to the service) when there is none.
+    """
+
+    MIN_CHARS = 12
+    MIN_PROBABILITY = 0.7
+
+    def __init__(self, cache_size=512):
+        self.cache_size = cache_size
+        self.last_confirmed = None
+        self._memo = OrderedDict()
+        self._lock = Lock()
+
+    def detect(self, text):
+        #language code or None
+        normalized = normalize_text(text)
+        if not normalized:
+            return self.last_confirmed
+        if len(normalized) < self.MIN_CHARS:
+            return self.last_confirmed
+
+        key = hashlib.sha1(normalized.encode('utf-8')).digest()
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key] or self.last_confirmed
+
+        code = self._detect(normalized)
+        with self._lock:
+            self._memo[key] = code
+            if len(self._memo) > self.cache_size:
+                self._memo.popitem(last=False)
+        return code or self.last_confirmed
+
+    def ready(self):
+        #profiles are loaded, detect() is cheap enough for the gui thread
+        return _factory_ready
+
+    def confirm(self, code):
+        #a translation from `code` went through - prefer it for short inputs
+        if code and code != AUTO_DETECT:
+            self.last_confirmed = code
+
+    def _detect(self, text):
+        _load_profiles()
+        from langdetect import detect_langs
+        from langdetect.lang_detect_exception import LangDetectException
+        try:
+            best = detect_langs(text)[0]
+        except (LangDetectException, IndexError):
+            return None
+        if best.prob < self.MIN_PROBABILITY:
+            return None
+        return best.lang
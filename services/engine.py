@@ -0,0 +1,231 @@
+# services/engine.py
+
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from services.ratelimit import Backoff, CircuitBreaker, TokenBucket
+from services.telemetry import telemetry
+
+GOOGLE_TRANSLATE_URL = "https://translate.google.com/m"
+MAX_CHARS = 5000
+#points the shared engine somewhere else, e.g. a local stand-in for benchmarks
+BACKEND_URL_ENV = 'TRANSLATOR_BACKEND_URL'
+#client-side quota, requests per second (google allows about 5)
+RATE_LIMIT_ENV = 'TRANSLATOR_RATE_LIMIT'
+
+
+class TranslationEngine:
+    """
+    asyncio translation service running on its own event loop thread.
+    All requests share one keep-alive HTTP session (no TLS handshake per
+    call) and at most `max_per_host` of them are in flight per host.
+    Callers on any thread use submit() (concurrent future) or the
+    blocking translate(); coroutines can await translate_async().
+    Identical requests still in flight are coalesced: later callers get
+    the future of the first one, so do not cancel() a submitted future.
+    Requests are paced by a token bucket; throttling, 5xx and connection
+    errors are retried with backoff, and after repeated failures the
+    circuit breaker fails calls fast (CircuitOpenError) for a while.
+    """
+
+    def __init__(self, base_url=GOOGLE_TRANSLATE_URL, max_per_host=4, timeout=10.0,
+                 rate=5.0, burst=10, retries=3):
+        #http stack is imported with the first engine, not at app start
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.base_url = base_url
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_per_host, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.bucket = TokenBucket(rate, burst)
+        self.backoff = Backoff(retries)
+        self.breaker = CircuitBreaker()
+        self.retried = 0
+        self._host_limits = {}
+        self._inflight = {}  # (text, source, target) -> future
+        self._inflight_lock = threading.Lock()
+        self.coalesced = 0
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name='translation-engine', daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _host_limit(self, url):
+        #loop thread only
+        host = urlparse(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return limit
+
+    async def translate_async(self, text, source_lang, target_lang):
+        text = text.strip()
+        if not text or source_lang == target_lang:
+            return text
+        if len(text) > MAX_CHARS:
+            from deep_translator.exceptions import NotValidLength
+            raise NotValidLength(text, 1, MAX_CHARS)
+
+        started = time.perf_counter()
+        attempts = []  # one entry per failed, retried attempt
+        error = None
+        try:
+            return await self._request(text, source_lang, target_lang, attempts)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            telemetry.record(
+                'translation', hit='network', chars=len(text), source=source_lang, target=target_lang,
+                latency_ms=round((time.perf_counter() - started) * 1000, 1),
+                retries=len(attempts), error=type(error).__name__ if error else None,
+            )
+
+    async def _request(self, text, source_lang, target_lang, attempts):
+        while True:
+            probe = self.breaker.check()
+            try:
+                body = await self._attempt(text, source_lang, target_lang, probe)
+            except Exception as e:
+                if not self._is_retryable(e) or len(attempts) >= self.backoff.retries:
+                    raise
+                #sleep outside the host slot, others may go meanwhile
+                await asyncio.sleep(self.backoff.delay(len(attempts), getattr(e, 'retry_after', None)))
+                attempts.append(type(e).__name__)
+                self.retried += 1
+                continue
+            return self._parse(body, text)
+
+    async def _attempt(self, text, source_lang, target_lang, probe):
+        #one call; a half-open probe gets a verdict on every exit path
+        try:
+            await self.bucket.acquire()
+            async with self._host_limit(self.base_url):
+                body = await self.loop.run_in_executor(
+                    None, self._fetch, text, source_lang, target_lang
+                )
+        except Exception as e:
+            #a rejected probe (403 and the like) does not close the circuit either
+            if probe or self._is_retryable(e):
+                self.breaker.record_failure()
+            raise
+        except BaseException:
+            if probe:
+                self.breaker.release_probe()  # cancelled, let the next call probe
+            raise
+        self.breaker.record_success()
+        return body
+
+    @staticmethod
+    def _is_retryable(error):
+        from deep_translator.exceptions import RequestError, TooManyRequests
+        from requests import ConnectionError, Timeout
+
+        if isinstance(error, (TooManyRequests, ConnectionError, Timeout)):
+            return True
+        return isinstance(error, RequestError) and getattr(error, 'status', 0) >= 500
+
+    def submit(self, text, source_lang, target_lang):
+        #thread-safe; returns concurrent.futures.Future
+        key = (text.strip(), source_lang, target_lang)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self._inflight[key] = asyncio.run_coroutine_threadsafe(
+                self.translate_async(text, source_lang, target_lang), self.loop
+            )
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key, future):
+        with self._inflight_lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def in_flight(self):
+        with self._inflight_lock:
+            return len(self._inflight)
+
+    def translate(self, text, source_lang, target_lang):
+        future = self.submit(text, source_lang, target_lang)
+        #every attempt may take the full timeout, plus the backoff sleeps
+        attempts = self.backoff.retries + 1
+        return future.result(attempts * self.timeout + self.backoff.max_total() + 1)
+
+    def stats(self):
+        return {
+            'queued': self.bucket.waiting,  # waiting for the rate limit
+            'in_flight': self.in_flight(),
+            'coalesced': self.coalesced,
+            'retried': self.retried,
+            'circuit': self.breaker.state,
+        }
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=2)
+        self.session.close()
+
+    def _fetch(self, text, source_lang, target_lang):
+        from deep_translator.exceptions import RequestError, TooManyRequests
+
+        params = {'sl': source_lang, 'tl': target_lang, 'q': text}
+        with self.session.get(self.base_url, params=params, timeout=self.timeout) as response:
+            if response.status_code == 429:
+                error = TooManyRequests()
+                retry_after = response.headers.get('Retry-After', '')
+                error.retry_after = float(retry_after) if retry_after.isdigit() else None
+                raise error
+            if response.status_code != 200:
+                error = RequestError(f"HTTP {response.status_code} from translation service")
+                error.status = response.status_code
+                raise error
+            return response.text
+
+    @staticmethod
+    def _parse(body, text):
+        #same result markup deep_translator's GoogleTranslator looks for
+        from bs4 import BeautifulSoup
+        from deep_translator.exceptions import TranslationNotFound
+
+        soup = BeautifulSoup(body, 'html.parser')
+        element = soup.find('div', {'class': 't0'}) or soup.find('div', {'class': 'result-container'})
+        if not element:
+            raise TranslationNotFound(text)
+        return element.get_text(strip=True)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def circuit_retry_after():
+    #seconds the shared engine keeps failing fast, 0 if healthy or not started
+    engine = _engine
+    return engine.breaker.retry_after() if engine is not None else 0.0
+
+
+def get_engine():
+    #shared engine for gui and batch callers, started on first use
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = TranslationEngine(
+                os.environ.get(BACKEND_URL_ENV) or GOOGLE_TRANSLATE_URL,
+                rate=float(os.environ.get(RATE_LIMIT_ENV) or 5.0),
+            )
+        return _engine
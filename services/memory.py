@@ -0,0 +1,187 @@
+# services/memory.py
+
+import math
+from collections import namedtuple
+from threading import Lock
+
+from services.cache import normalize_text
+
+#score is 1.0 for an exact match, the trigram similarity otherwise
+MemoryMatch = namedtuple('MemoryMatch', 'source_text translated_text score exact')
+
+
+def ngrams(text, n=3):
+    #character n-grams of the padded, lower-cased text
+    padded = f" {text.lower()} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def similarity(a, b):
+    #dice coefficient of two n-gram sets
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class _PairIndex:
+    #exact and fuzzy index for one (source, target) language pair
+    def __init__(self):
+        self.exact = {}  # normalized source -> entry id
+        self.postings = {}  # n-gram -> set of entry ids
+        self.entries = {}  # entry id -> (normalized source, translation, n-grams)
+
+
+class TranslationMemory:
+    """
+    Translation memory over the history: previous translations are served
+    again without a network call.
+    Exact repeats (after whitespace normalization) come from a hash index;
+    near-repeats from a character-trigram index over source texts of the
+    same language pair, accepted when the similarity is at least
+    `threshold` (None turns fuzzy matching off). A fuzzy match is another
+    text's translation, to be shown as provisional only. The newest
+    translation of a text wins. At most `max_entries` texts are kept.
+    """
+
+    #looser threshold for when the translation service is unavailable
+    DEGRADED_THRESHOLD = 0.75
+    #longer texts are matched exactly only: their n-gram sets hit most of
+    #the index, and edits to them are handled sentence by sentence anyway
+    MAX_FUZZY_CHARS = 1000
+
+    def __init__(self, threshold=0.9, max_entries=50_000):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self._pairs = {}
+        self._ids = 0
+        self._size = 0
+        self._lock = Lock()
+
+    def load(self, storage, page_size=500):
+        #indexes the stored history, newest first; run it off the gui thread
+        cursor = None
+        while self._size < self.max_entries:
+            entries, cursor = storage.get_page(cursor, page_size)
+            for entry in entries:
+                self._add(entry['source_text'], entry['translated_text'],
+                          entry['source_lang'], entry['target_lang'], replace=False)
+            if cursor is None:
+                break
+
+    def add(self, source_text, translated_text, source_lang, target_lang):
+        self._add(source_text, translated_text, source_lang, target_lang, replace=True)
+
+    def _add(self, source_text, translated_text, source_lang, target_lang, replace):
+        normalized = normalize_text(source_text)
+        if not normalized or not translated_text:
+            return
+        with self._lock:
+            pair = self._pairs.setdefault((source_lang, target_lang), _PairIndex())
+            old_id = pair.exact.get(normalized)
+            if old_id is not None:
+                if not replace:
+                    return  # loading: a newer translation is indexed already
+                self._remove_id(pair, old_id)
+            elif self._size >= self.max_entries:
+                return
+
+            self._ids += 1
+            grams = ngrams(normalized)
+            pair.exact[normalized] = self._ids
+            pair.entries[self._ids] = (normalized, translated_text, grams)
+            for gram in grams:
+                pair.postings.setdefault(gram, set()).add(self._ids)
+            self._size += 1
+
+    def remove(self, source_text, source_lang, target_lang, translated_text=None):
+        #with translated_text, only if that is still the indexed translation
+        normalized = normalize_text(source_text)
+        with self._lock:
+            pair = self._pairs.get((source_lang, target_lang))
+            entry_id = pair and pair.exact.get(normalized)
+            if entry_id is None:
+                return
+            if translated_text is None or pair.entries[entry_id][1] == translated_text:
+                self._remove_id(pair, entry_id)
+
+    def _remove_id(self, pair, entry_id):
+        normalized, _, grams = pair.entries.pop(entry_id)
+        del pair.exact[normalized]
+        for gram in grams:
+            ids = pair.postings[gram]
+            ids.discard(entry_id)
+            if not ids:
+                del pair.postings[gram]
+        self._size -= 1
+
+    def lookup(self, text, source_lang, target_lang, threshold=None):
+        #MemoryMatch or None; threshold overrides self.threshold
+        normalized = normalize_text(text)
+        if not normalized:
+            return None
+        if threshold is None:
+            threshold = self.threshold
+        with self._lock:
+            pair = self._pairs.get((source_lang, target_lang))
+            match = pair and self._lookup(pair, normalized, threshold)
+            if match is None:
+                self.misses += 1
+            elif match.exact:
+                self.hits += 1
+            else:
+                self.fuzzy_hits += 1
+            return match
+
+    def _lookup(self, pair, normalized, threshold):
+        entry_id = pair.exact.get(normalized)
+        if entry_id is not None:
+            source, translated, _ = pair.entries[entry_id]
+            return MemoryMatch(source, translated, 1.0, True)
+        if not threshold or len(normalized) > self.MAX_FUZZY_CHARS:
+            return None
+
+        grams = ngrams(normalized)
+        t = threshold
+        #a candidate at or above the threshold shares at least `need` n-grams,
+        #so it is found among the len - need + 1 rarest n-grams of the query
+        need = max(1, math.ceil(t * len(grams) / (2 - t)))
+        rarest = sorted(grams, key=lambda g: len(pair.postings.get(g, ())))
+        candidates = set()
+        for gram in rarest[:len(grams) - need + 1]:
+            candidates.update(pair.postings.get(gram, ()))
+
+        #dice >= t also bounds the size of the candidate's n-gram set
+        low, high = len(grams) * t / (2 - t), len(grams) * (2 - t) / t
+        best = None
+        for entry_id in candidates:
+            source, translated, entry_grams = pair.entries[entry_id]
+            if not low <= len(entry_grams) <= high:
+                continue
+            score = similarity(grams, entry_grams)
+            if score >= t and (best is None or score > best.score):
+                best = MemoryMatch(source, translated, score, False)
+        return best
+
+    def clear(self):
+        with self._lock:
+            self._pairs.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.fuzzy_hits + self.misses
+            return {
+                'entries': self._size,
+                'hits': self.hits,
+                'fuzzy_hits': self.fuzzy_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.fuzzy_hits) / total if total else 0.0,
+            }
+
+    def __len__(self):
+        return self._size
@@ -0,0 +1,242 @@
+# services/playback.py
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+
+from PySide6.QtCore import QObject, QBuffer, QIODevice, QUrl, Signal
+
+from services.speak import gtts_langs, iter_speech
+
+
+class PlaybackService(QObject):
+    """
+    Text-to-speech off the GUI thread.
+    A long-lived synthesis thread takes requests from a queue and streams
+    gTTS output into memory part by part; each part is handed to a
+    QMediaPlayer as soon as it arrives, so playback starts before synthesis
+    is done. A new request or stop() cancels the current one.
+    Progress goes out through `status` as (UI_TRANSLATIONS key, detail).
+    """
+
+    status = Signal(str, str)
+    _chunk_ready = Signal(int, bytes)  # request id, mp3 bytes (synth thread -> gui)
+    _synthesis_done = Signal(int, str)  # request id, error text or ""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ids = itertools.count(1)
+        self._current = None  # (id, text, lang) being synthesized or played
+        self._requests = queue.Queue()
+        self._clips = []
+        self._buffer = None
+        self._synthesizing = False
+        self._player = None
+
+        self._chunk_ready.connect(self._on_chunk)
+        self._synthesis_done.connect(self._on_synthesis_done)
+        threading.Thread(target=self._synthesize_loop, name='tts', daemon=True).start()
+
+    def speak(self, text, lang):
+        """
+        Starts speaking `text`; asking again for what is already playing
+        stops it instead. Returns True if playback was started.
+        """
+        if not text.strip():
+            return False
+        if self._current is not None and self._current[1:] == (text, lang):
+            self.stop()
+            return False
+        if lang not in gtts_langs:
+            self.status.emit('playback_error', f"Language code {lang} not supported by gTTS")
+            return False
+
+        self._reset()
+        self._current = (next(self._ids), text, lang)
+        self._synthesizing = True
+        self._requests.put(self._current)
+        self.status.emit('playback_started', "")
+        return True
+
+    def stop(self):
+        if self._current is None:
+            return
+        self._reset()
+        self.status.emit('playback_stopped', "")
+
+    def is_active(self):
+        return self._current is not None
+
+    def shutdown(self):
+        self._reset()
+        self._requests.put(None)
+
+    @property
+    def player(self):
+        #QtMultimedia (and its ffmpeg backend) loads on the first playback
+        if self._player is None:
+            from PySide6.QtMultimedia import QAudioOutput, QMediaPlayer
+            self.audio_output = QAudioOutput(self)
+            self._player = QMediaPlayer(self)
+            self._player.setAudioOutput(self.audio_output)
+            self._player.mediaStatusChanged.connect(self._on_media_status)
+            self._player.errorOccurred.connect(self._on_player_error)
+        return self._player
+
+    def _is_playing(self):
+        if self._player is None:
+            return False
+        return self._player.playbackState() == self._player.PlaybackState.PlayingState
+
+    def _reset(self):
+        self._current = None
+        self._synthesizing = False
+        self._clips.clear()
+        if self._player is not None:
+            self._player.stop()
+
+    def _is_current(self, request_id):
+        current = self._current
+        return current is not None and current[0] == request_id
+
+    #synthesis thread
+
+    def _synthesize_loop(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            request_id, text, lang = request
+            if not self._is_current(request_id):
+                continue
+            try:
+                for chunk in iter_speech(text, lang, cancelled=lambda: not self._is_current(request_id)):
+                    self._chunk_ready.emit(request_id, chunk)
+                self._synthesis_done.emit(request_id, "")
+            except Exception as e:
+                self._synthesis_done.emit(request_id, str(e))
+
+    #gui thread
+
+    def _on_chunk(self, request_id, chunk):
+        if not self._is_current(request_id):
+            return
+        self._clips.append(chunk)
+        if not self._is_playing():
+            self._play_next()
+
+    def _on_synthesis_done(self, request_id, error):
+        if not self._is_current(request_id):
+            return
+        self._synthesizing = False
+        if error:
+            self._reset()
+            self.status.emit('playback_error', error)
+        elif not self._clips and not self._is_playing():
+            self._finish()
+
+    def _play_next(self):
+        if not self._clips:
+            return False
+        #the buffer must outlive playback, keep a reference; setData copies
+        previous = self._buffer
+        self._buffer = QBuffer(self)
+        self._buffer.setData(self._clips.pop(0))
+        self._buffer.open(QIODevice.ReadOnly)
+        try:
+            #QtMultimedia may fail to load (missing libpulse and the like)
+            self.player.setSourceDevice(self._buffer, QUrl("speech.mp3"))
+            self.player.play()
+        except Exception as e:
+            self._reset()
+            self.status.emit('playback_error', str(e))
+            return False
+        if previous is not None:
+            previous.deleteLater()
+        return True
+
+    def _on_media_status(self, media_status):
+        if media_status != self.player.MediaStatus.EndOfMedia or self._current is None:
+            return
+        if not self._play_next() and not self._synthesizing and self._current is not None:
+            self._finish()
+
+    def _on_player_error(self, error, message):
+        if self._current is None:
+            return
+        self._reset()
+        self.status.emit('playback_error', message)
+
+    def _finish(self):
+        self._current = None
+        self.status.emit('playback_finished', "")
+
+
+class SpeechPrefetcher:
+    """
+    Low-priority background synthesis of text that is likely to be played
+    next (a fresh translation), so the speaker button starts instantly from
+    the audio cache. Only the latest request is kept; cancel() or a newer
+    request abandons the current one between gTTS parts. At most
+    `chars_per_minute` characters are prefetched per rolling minute, and
+    nothing is prefetched while `is_busy()` (foreground playback) is true.
+    """
+
+    def __init__(self, chars_per_minute=1500, is_busy=None):
+        self.chars_per_minute = chars_per_minute
+        self.is_busy = is_busy
+        self._history = deque()  # (time, chars) of recent prefetches
+        self._pending = None
+        self._generation = 0
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._loop, name='tts-prefetch', daemon=True).start()
+
+    def prefetch(self, text, lang):
+        if not text.strip() or lang not in gtts_langs:
+            return False
+        with self._lock:
+            if not self._within_budget(len(text)):
+                return False
+            self._generation += 1
+            self._pending = (self._generation, text, lang)
+        self._wakeup.set()
+        return True
+
+    def cancel(self):
+        with self._lock:
+            self._generation += 1
+            self._pending = None
+
+    def _within_budget(self, chars):
+        now = time.monotonic()
+        while self._history and now - self._history[0][0] > 60:
+            self._history.popleft()
+        used = sum(c for _, c in self._history)
+        if used + chars > self.chars_per_minute:
+            return False
+        self._history.append((now, chars))
+        return True
+
+    def _is_current(self, generation):
+        return generation == self._generation
+
+    def _loop(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                request, self._pending = self._pending, None
+            if request is None:
+                continue
+            generation, text, lang = request
+            if self.is_busy and self.is_busy():
+                continue  # the user is listening to something already
+            try:
+                for _ in iter_speech(text, lang, cancelled=lambda: not self._is_current(generation),
+                                     origin='prefetch'):
+                    pass
+            except Exception as e:
+                print(f"TTS prefetch failed: {e}")
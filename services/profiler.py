@@ -0,0 +1,85 @@
+# services/profiler.py
+
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+
+#set to a file path to get a startup report, e.g. startup_profile.json
+ENV_VAR = 'TRANSLATOR_PROFILE_STARTUP'
+
+
+class StartupProfiler:
+    """
+    Opt-in timing of startup phases (imports, storage, screens, first
+    paint) written as a JSON report, so cold start can be compared across
+    releases and packaging changes. Disabled unless a report path is set;
+    then every call is a no-op.
+    """
+
+    def __init__(self, report_path=None):
+        self.report_path = report_path
+        self.enabled = bool(report_path)
+        self.t0 = time.perf_counter()
+        self.phases = []
+        self.marks = {}
+        self._modules_at_start = set(sys.modules)
+        self._written = False
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.environ.get(ENV_VAR))
+
+    def _now_ms(self):
+        return (time.perf_counter() - self.t0) * 1000
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = self._now_ms()
+        try:
+            yield
+        finally:
+            self.phases.append({
+                'name': name,
+                'start_ms': round(start, 2),
+                'duration_ms': round(self._now_ms() - start, 2),
+            })
+
+    def mark(self, name):
+        if self.enabled and name not in self.marks:
+            self.marks[name] = round(self._now_ms(), 2)
+
+    def report(self):
+        loaded = sorted(set(sys.modules) - self._modules_at_start)
+        return {
+            'version': 1,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'total_ms': round(self._now_ms(), 2),
+            'phases': self.phases,
+            'marks': self.marks,
+            'modules_loaded': len(loaded),
+            #top-level packages imported during startup - a new one here
+            #usually means a new eager import
+            'packages_loaded': sorted({name.split('.')[0] for name in loaded}),
+        }
+
+    def write(self):
+        if not self.enabled or self._written:
+            return
+        self._written = True
+        try:
+            with open(self.report_path, 'w', encoding='utf-8') as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"Failed to write startup profile: {e}")
+
+
+#process-wide profiler; main.py imports this module before anything heavy
+startup = StartupProfiler.from_env()
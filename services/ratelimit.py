@@ -0,0 +1,137 @@
+# services/ratelimit.py
+
+import asyncio
+import random
+import time
+from threading import Lock
+
+
+class TokenBucket:
+    """
+    Client-side request quota: `rate` requests per second on average,
+    bursts of up to `burst`. A caller reserves a token and waits until it
+    is due, so waiters are served in order and the send rate stays at the
+    quota instead of hammering the service into throttling.
+    """
+
+    def __init__(self, rate=5.0, burst=10):
+        self.rate = rate
+        self.burst = burst
+        self.waiting = 0  # callers sleeping for a token (queue depth)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def reserve(self, now=None):
+        #takes a token; seconds until it may be used (0 if right away)
+        with self._lock:
+            now = time.monotonic() if now is None else now
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay <= 0:
+            return
+        with self._lock:
+            self.waiting += 1
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+
+class Backoff:
+    #exponential backoff with full jitter: attempt n waits uniform(0, base * factor**n)
+    def __init__(self, retries=3, base=0.5, factor=2.0, max_delay=8.0, rng=None):
+        self.retries = retries
+        self.base = base
+        self.factor = factor
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def cap(self, attempt):
+        return min(self.max_delay, self.base * self.factor ** attempt)
+
+    def delay(self, attempt, retry_after=None):
+        delay = self._rng.uniform(0, self.cap(attempt))
+        if retry_after:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def max_total(self):
+        return sum(self.cap(attempt) for attempt in range(self.retries))
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"translation service unavailable, retrying in {retry_after:.0f} s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing service. After `failure_threshold` failures in
+    a row the circuit opens and calls fail fast for `reset_after` seconds;
+    then a single probe call is let through (half open) - success closes
+    the circuit, failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_after=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = Lock()
+
+    def retry_after(self):
+        #seconds until the next probe, 0 when calls go through
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_after - time.monotonic())
+
+    def is_open(self):
+        return self.retry_after() > 0
+
+    def check(self):
+        #raises CircuitOpenError unless a call may be made now; True when the
+        #caller is the half-open probe and must report back (success, failure
+        #or release_probe)
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+            waited = time.monotonic() - self._opened_at
+            if self.state == self.OPEN and waited >= self.reset_after:
+                self.state = self.HALF_OPEN  # this caller is the probe
+                return True
+            if self.state == self.HALF_OPEN:
+                raise CircuitOpenError(1.0)  # probe still running
+            raise CircuitOpenError(self.reset_after - waited)
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def release_probe(self):
+        #the probe ended without an answer; the next call probes again
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic() - self.reset_after
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
@@ -0,0 +1,174 @@
+# services/segments.py
+
+import hashlib
+import re
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+from threading import Lock
+
+from services.cache import TranslationCache
+from services.engine import MAX_CHARS
+from services.translate import translate_text
+
+#sentence ends (keeps the punctuation with the sentence) and line breaks
+_SEPARATOR_RE = re.compile(r'((?<=[.!?…。！？])\s+|\s*\n\s*)')
+
+
+def split_segments(text):
+    """
+    Split text into [segment, separator, segment, separator, ..., segment].
+    Joining the list gives back the original text.
+    """
+    return _SEPARATOR_RE.split(text)
+
+
+def segment_hash(segment):
+    return hashlib.sha1(segment.strip().encode('utf-8')).hexdigest()
+
+
+def pack_batches(segments, max_chars):
+    #consecutive segments grouped so each newline-joined batch stays under
+    #max_chars; a longer segment gets a batch of its own
+    batches, batch, size = [], [], 0
+    for segment in segments:
+        if batch and size + 1 + len(segment) > max_chars:
+            batches.append(batch)
+            batch, size = [], 0
+        size += len(segment) + (1 if batch else 0)
+        batch.append(segment)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def split_long(segment, max_chars):
+    #a sentence over the limit, cut at spaces (hard cut inside a huge word)
+    parts, rest = [], segment.strip()
+    while len(rest) > max_chars:
+        cut = rest.rfind(' ', 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        parts.append(rest[:cut].strip())
+        rest = rest[cut:].strip()
+    if rest:
+        parts.append(rest)
+    return parts
+
+
+class IncrementalTranslator:
+    """
+    Translates long texts sentence by sentence, caching each sentence's
+    translation by content hash. After an edit only changed or new
+    sentences go to the network, the rest come from the cache and the
+    output is reassembled. Missing sentences are sent one per line, packed
+    into batches of at most `chunk_chars`, up to `max_parallel` batches at
+    a time - so texts over the service limit (MAX_CHARS) work too.
+    `progress(text)` gets the translated part from the start of the text
+    whenever it grows; `cancelled()` is checked as batches finish.
+    Short texts are passed straight to `translate`.
+    """
+
+    MIN_CHARS = 200
+
+    def __init__(self, translate=translate_text, cache=None, chunk_chars=2000, max_parallel=4):
+        self.translate = translate
+        self.cache = cache if cache is not None else TranslationCache(max_entries=2000)
+        self.chunk_chars = min(chunk_chars, MAX_CHARS)
+        self.max_parallel = max_parallel
+        self.chars_requested = 0
+        self.chars_reused = 0
+        self._lock = Lock()
+        self._executor = None  # started with the first text of several batches
+
+    def __call__(self, text, source_lang, target_lang, progress=None, cancelled=None):
+        pieces = split_segments(text)
+        if len(text) <= MAX_CHARS and (len(text) < self.MIN_CHARS or len(pieces) < 3):
+            return self.translate(text, source_lang, target_lang)
+
+        segments = pieces[0::2]
+        separators = pieces[1::2]
+        translated = [None] * len(segments)
+        missing = {}  # segment text -> positions
+        for i, segment in enumerate(segments):
+            if not segment.strip():
+                translated[i] = segment
+                continue
+            cached = self.cache.get(segment_hash(segment), source_lang, target_lang)
+            if cached is not None:
+                translated[i] = cached
+            else:
+                missing.setdefault(segment.strip(), []).append(i)
+
+        done = 0  # translated[:done] is complete
+
+        def report():
+            nonlocal done
+            start = done
+            while done < len(segments) and translated[done] is not None:
+                done += 1
+            if progress is not None and start < done < len(segments):
+                progress(self._join(translated[:done], separators))
+
+        report()
+        batches = pack_batches(list(missing), self.chunk_chars)
+        for batch, results in self._run_batches(batches, source_lang, target_lang, cancelled):
+            for segment, result in zip(batch, results):
+                self.cache.put(segment_hash(segment), source_lang, target_lang, result)
+                for i in missing[segment]:
+                    translated[i] = result
+            report()
+
+        with self._lock:
+            sent = sum(len(s) for s in missing)
+            self.chars_requested += sent
+            self.chars_reused += sum(len(s) for s in segments) - sent
+
+        return self._join(translated, separators)
+
+    @staticmethod
+    def _join(translated, separators):
+        #separators (spaces/newlines) are kept from the source
+        pieces = []
+        for i, segment in enumerate(translated):
+            if i:
+                pieces.append(separators[i - 1])
+            pieces.append(segment)
+        return "".join(pieces)
+
+    def _run_batches(self, batches, source_lang, target_lang, cancelled):
+        #yields (batch, translations) as batches finish, in any order
+        if len(batches) <= 1:
+            for batch in batches:
+                yield batch, self._translate_batch(batch, source_lang, target_lang)
+            return
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_parallel, thread_name_prefix='translate-chunk')
+        futures = {
+            self._executor.submit(self._translate_batch, batch, source_lang, target_lang): batch
+            for batch in batches
+        }
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+                if cancelled is not None and cancelled():
+                    raise CancelledError()
+        finally:
+            for future in futures:
+                future.cancel()  # only the ones not started yet
+
+    def _translate_batch(self, segments, source_lang, target_lang):
+        if len(segments) == 1:
+            return [self._translate_segment(segments[0], source_lang, target_lang)]
+        #one request, one segment per line; fall back if lines got merged
+        joined = self.translate("\n".join(segments), source_lang, target_lang)
+        lines = [line.strip() for line in joined.split("\n") if line.strip()]
+        if len(lines) == len(segments):
+            return lines
+        return [self._translate_segment(segment, source_lang, target_lang) for segment in segments]
+
+    def _translate_segment(self, segment, source_lang, target_lang):
+        if len(segment) <= MAX_CHARS:
+            return self.translate(segment, source_lang, target_lang)
+        parts = split_long(segment, self.chunk_chars)
+        return " ".join(self.translate(part, source_lang, target_lang) for part in parts)
@@ -1,51 +1,65 @@
-from gtts import gTTS
-from playsound import playsound
-import tempfile
-import os
-import gtts.langs
+import time
 
-gtts_langs = gtts.lang.tts_langs()
+from constants import TTS_LANGUAGES
+from services.audio_cache import AudioCache
+from services.telemetry import telemetry
 
-def speak_text(text: str, lang: str, on_status=None):
-    if not text.strip():
-        return
+#bundled snapshot - importing gtts just for this table slows down startup
+gtts_langs = TTS_LANGUAGES
 
-    current_audio_file = None
-    try:
+#synthesized phrases, replayed without a network round-trip
+audio_cache = AudioCache()
 
-        if lang not in gtts_langs:
-            if on_status:
-                on_status(f"playback_error: Language code {lang} not supported by gTTS")
-            return
 
-        # Используем код языка напрямую, без дополнительных преобразований
-        gtts_lang = lang
+def _cache_key(text, lang, slow):
+    return AudioCache.make_key(text, lang, slow=slow, tld='com')
 
-        # Создаём временный файл
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_file:
-            current_audio_file = temp_file.name
 
-        if on_status:
-            on_status("playback_started")
+def iter_speech(text: str, lang: str, slow: bool = False, cancelled=None, origin='playback'):
+    """
+    Yields mp3 bytes for `text` spoken in `lang`: the whole cached file,
+    or gTTS output part by part as it is synthesized (each part is a
+    playable clip). A full synthesis is stored in the audio cache;
+    `cancelled()` returning True stops it early. Every call is recorded in
+    telemetry as a 'tts' event tagged with `origin`.
+    """
+    started = time.perf_counter()
+    event = {'origin': origin, 'chars': len(text), 'lang': lang, 'hit': 'network',
+             'first_part_ms': None, 'cancelled': False, 'error': None}
+    try:
+        for part in _iter_speech(text, lang, slow, cancelled, event):
+            if event['first_part_ms'] is None:
+                event['first_part_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            yield part
+    except GeneratorExit:
+        event['cancelled'] = True
+        raise
+    except Exception as e:
+        event['error'] = type(e).__name__
+        raise
+    finally:
+        telemetry.record('tts', latency_ms=round((time.perf_counter() - started) * 1000, 1), **event)
 
-        # Создаём и сохраняем голос
-        tts = gTTS(text=text, lang=gtts_lang)
-        tts.save(current_audio_file)
 
-        # Проигрываем
-        playsound(current_audio_file)
+def _iter_speech(text, lang, slow, cancelled, event):
+    key = _cache_key(text, lang, slow)
+    path = audio_cache.get(key)
+    if path is not None:
+        event['hit'] = 'cache'
+        with open(path, 'rb') as f:
+            yield f.read()
+        return
 
-        print("TEMP FILE PATH:", current_audio_file)
-        print("EXISTS:", os.path.exists(current_audio_file))
-        print("SIZE:", os.path.getsize(current_audio_file))
-        print("IS STRING:", isinstance(current_audio_file, str))
+    from gtts import gTTS  # deferred to the first synthesis
+
+    # Используем код языка напрямую, без дополнительных преобразований
+    tts = gTTS(text=text, lang=lang, slow=slow)
+    parts = []
+    for part in tts.stream():
+        if cancelled and cancelled():
+            event['cancelled'] = True
+            return
+        parts.append(part)
+        yield part
+    audio_cache.put(key, b"".join(parts))
 
-    except Exception as e:
-        if on_status:
-            on_status(f"playback_error: {e}")
-    finally:
-        if current_audio_file and os.path.exists(current_audio_file):
-            try:
-                os.remove(current_audio_file)
-            except Exception as e:
-                print(f"Failed to remove temp file: {e}")
\ No newline at end of file
@@ -2,11 +2,36 @@
 
 import json
 import os
+import sqlite3
+import time
+import uuid
+from collections import namedtuple
 from datetime import datetime
+from threading import Event, Lock, Thread
+
+
+def _new_record(source_text, translated_text, source_lang, target_lang):
+    return {
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'source_text': source_text,
+        'translated_text': translated_text,
+        'source_lang': source_lang,
+        'target_lang': target_lang
+    }
+
+
+#what identifies an entry that has no (or not yet an) id
+_ENTRY_FIELDS = ('timestamp', 'source_text', 'translated_text', 'source_lang', 'target_lang')
+
+
+def _same_entry(a, b):
+    return all(a.get(field) == b.get(field) for field in _ENTRY_FIELDS)
+
 
 class TranslationsStorage:
     def __init__(self, file_path='translations.json'):
         self.file_path = file_path
+        self._lock = Lock()
         self._ensure_file_exists()
 
     def _ensure_file_exists(self):
@@ -19,30 +44,53 @@ class TranslationsStorage:
         if not translated_text.strip():
             return
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        translation = {
-            'timestamp': timestamp,
-            'source_text': source_text,
-            'translated_text': translated_text,
-            'source_lang': source_lang,
-            'target_lang': target_lang
-        }
-        translations = self._load_translations()
-        translations.insert(0, translation)
-        self._save_translations(translations)
+        self.save_batch([_new_record(source_text, translated_text, source_lang, target_lang)])
+
+    def save_batch(self, records):
+        #records oldest first, as from _new_record; one rewrite for all of them
+        with self._lock:
+            translations = self._load_translations()
+            translations[:0] = reversed(records)
+            self._save_translations(translations)
 
     def get_translations(self, limit=50):
-        translations = self._load_translations()
+        with self._lock:
+            translations = self._load_translations()
         return translations[:limit]
 
+    def get_page(self, cursor=None, limit=50):
+        #cursor is the number of older entries not returned yet, so entries
+        #saved in between do not shift it; returns (entries, next_cursor)
+        with self._lock:
+            translations = self._load_translations()
+        offset = 0 if cursor is None else max(0, len(translations) - cursor)
+        page = translations[offset:offset + limit]
+        remaining = len(translations) - offset - len(page)
+        return page, remaining or None
+
     def delete_translation(self, index):
-        translations = self._load_translations()
-        if 0 <= index < len(translations):
-            translations.pop(index)
-            self._save_translations(translations)
+        with self._lock:
+            translations = self._load_translations()
+            if 0 <= index < len(translations):
+                translations.pop(index)
+                self._save_translations(translations)
+
+    def delete_entry(self, entry):
+        #entry as returned by get_page; unlike an index, not shifted by new saves
+        with self._lock:
+            translations = self._load_translations()
+            for i, translation in enumerate(translations):
+                if _same_entry(translation, entry):
+                    translations.pop(i)
+                    self._save_translations(translations)
+                    break
 
     def clear_translations(self):
-        self._save_translations([])
+        with self._lock:
+            self._save_translations([])
+
+    def close(self):
+        pass
 
     def _load_translations(self):
         try:
@@ -54,3 +102,501 @@ class TranslationsStorage:
     def _save_translations(self, translations):
         with open(self.file_path, 'w', encoding='utf-8') as f:
             json.dump(translations, f, ensure_ascii=False, indent=2)
+
+
+def _load_legacy_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+#position in the log to continue reading backwards from, plus tombstones
+#already seen after that position; generation guards against clear/compact
+_LogCursor = namedtuple('_LogCursor', 'position deleted generation')
+
+
+class AppendOnlyTranslationsStorage:
+    """
+    Append-only history log: one JSON record per line, oldest first.
+    Saving appends a single line instead of rewriting the whole history,
+    deletions append a tombstone, and reads walk the file backwards so
+    get_translations(limit) only parses the newest `limit` records.
+    Has the same public API as TranslationsStorage.
+    """
+
+    FSYNC_ALWAYS = 'always'      # fsync after every record
+    FSYNC_INTERVAL = 'interval'  # fsync at most every fsync_interval seconds
+    FSYNC_NEVER = 'never'        # leave it to the OS
+
+    READ_BLOCK_SIZE = 64 * 1024
+    COMPACT_AFTER_DELETES = 200
+
+    def __init__(self, file_path='translations.jsonl', legacy_path='translations.json',
+                 fsync=FSYNC_INTERVAL, fsync_interval=5.0):
+        if fsync not in (self.FSYNC_ALWAYS, self.FSYNC_INTERVAL, self.FSYNC_NEVER):
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.file_path = file_path
+        self.legacy_path = legacy_path
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._last_fsync = time.monotonic()
+        self._deletes = 0
+        self._generation = 0
+        self._lock = Lock()
+        self._migrate_legacy()
+        self._ensure_file_exists()
+        self._file = open(self.file_path, 'ab')
+        self._repair_tail()
+
+    def _ensure_file_exists(self):
+        if not os.path.exists(self.file_path):
+            open(self.file_path, 'wb').close()
+
+    def _repair_tail(self):
+        #a torn last line must not swallow the next appended record
+        with open(self.file_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+        if last != b'\n':
+            self._file.write(b'\n')
+            self._file.flush()
+
+    def _migrate_legacy(self):
+        #one-time import of the old json array (newest first) into the log
+        if os.path.exists(self.file_path) or not self.legacy_path:
+            return
+        if not os.path.exists(self.legacy_path):
+            return
+        translations = _load_legacy_json(self.legacy_path)
+        if translations is None:
+            return
+
+        tmp_path = self.file_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            for entry in reversed(translations):
+                record = dict(entry)
+                record.setdefault('id', uuid.uuid4().hex)
+                f.write(self._encode(record))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.file_path)
+        os.replace(self.legacy_path, self.legacy_path + '.migrated')
+
+    @staticmethod
+    def _encode(record):
+        return (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+    def _append(self, *records):
+        self._file.write(b''.join(self._encode(record) for record in records))
+        self._file.flush()
+        if self.fsync == self.FSYNC_ALWAYS:
+            os.fsync(self._file.fileno())
+        elif self.fsync == self.FSYNC_INTERVAL:
+            now = time.monotonic()
+            if now - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+
+    def save_translation(self, source_text, translated_text, source_lang, target_lang):
+
+        if not translated_text.strip():
+            return
+
+        self.save_batch([_new_record(source_text, translated_text, source_lang, target_lang)])
+
+    def save_batch(self, records):
+        #records oldest first; one write (and at most one fsync) for all of them
+        records = [dict(record, id=uuid.uuid4().hex) for record in records]
+        with self._lock:
+            self._append(*records)
+
+    def get_translations(self, limit=50):
+        return self.get_page(None, limit)[0]
+
+    def get_page(self, cursor=None, limit=50):
+        #returns (entries, next_cursor); next_cursor is None on the last page
+        with self._lock:
+            if cursor is None:
+                position, deleted = None, set()
+            elif cursor.generation != self._generation:
+                return [], None
+            else:
+                position, deleted = cursor.position, set(cursor.deleted)
+
+            result = []
+            for line_end, entry in self._iter_newest_first(position, deleted):
+                if len(result) == limit:
+                    #one record past the page: the next page starts with it
+                    return result, _LogCursor(line_end, frozenset(deleted), self._generation)
+                result.append(entry)
+            return result, None
+
+    def delete_translation(self, index):
+        if index < 0:
+            return
+        with self._lock:
+            for i, (_, entry) in enumerate(self._iter_newest_first()):
+                if i == index:
+                    self._append({'op': 'delete', 'id': entry['id']})
+                    self._deletes += 1
+                    break
+            if self._deletes >= self.COMPACT_AFTER_DELETES:
+                self._compact()
+
+    def delete_entry(self, entry):
+        #by id; entries read before they were written (WriteBehindStorage)
+        #have none yet and are looked up by content
+        with self._lock:
+            entry_id = entry.get('id')
+            if entry_id is None:
+                entry_id = next(
+                    (e['id'] for _, e in self._iter_newest_first() if _same_entry(e, entry)), None
+                )
+                if entry_id is None:
+                    return
+            self._append({'op': 'delete', 'id': entry_id})
+            self._deletes += 1
+            if self._deletes >= self.COMPACT_AFTER_DELETES:
+                self._compact()
+
+    def clear_translations(self):
+        with self._lock:
+            self._file.close()
+            open(self.file_path, 'wb').close()
+            self._file = open(self.file_path, 'ab')
+            self._deletes = 0
+            self._generation += 1
+
+    def compact(self):
+        #rewrite the log without deleted records and tombstones
+        with self._lock:
+            self._compact()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+    def _compact(self):
+        live = [entry for _, entry in self._iter_newest_first()]
+        tmp_path = self.file_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            for entry in reversed(live):
+                f.write(self._encode(entry))
+            f.flush()
+            os.fsync(f.fileno())
+        self._file.close()
+        os.replace(tmp_path, self.file_path)
+        self._file = open(self.file_path, 'ab')
+        self._deletes = 0
+        self._generation += 1
+
+    def _iter_newest_first(self, end=None, deleted=None):
+        #(line end offset, record) for live records, newest first; tombstones
+        #always follow their record in the file, so reading backwards we see
+        #them before the record
+        if deleted is None:
+            deleted = set()
+        for line_end, line in self._read_lines_reversed(end):
+            try:
+                record = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue  # torn write at the tail
+            if record.get('op') == 'delete':
+                deleted.add(record.get('id'))
+                continue
+            if record.get('id') in deleted:
+                continue
+            yield line_end, record
+
+    def _read_lines_reversed(self, end=None):
+        #(absolute offset just past the line, line bytes) for lines in [0, end)
+        with open(self.file_path, 'rb') as f:
+            if end is None:
+                f.seek(0, os.SEEK_END)
+                end = f.tell()
+            position = end
+            tail = b''
+            while position > 0:
+                size = min(self.READ_BLOCK_SIZE, position)
+                position -= size
+                f.seek(position)
+                block = f.read(size) + tail
+                lines = block.split(b'\n')
+                tail = lines.pop(0)
+                line_end = position + len(block)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line_end, line
+                    line_end -= len(line) + 1
+            if tail.strip():
+                yield len(tail), tail
+
+
+class SQLiteTranslationsStorage:
+    """
+    History in a SQLite database (WAL mode).
+    Same public API as TranslationsStorage; reads and deletes are index
+    lookups instead of loading the whole history into memory.
+    """
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS translations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            source_text TEXT NOT NULL,
+            translated_text TEXT NOT NULL,
+            source_lang TEXT NOT NULL,
+            target_lang TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_translations_timestamp ON translations (timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_translations_langs ON translations (source_lang, target_lang)",
+    )
+
+    #constant sql strings - sqlite3 keeps them prepared in its per-connection
+    #statement cache, so they are compiled once and reused across calls
+    _INSERT = (
+        "INSERT INTO translations (timestamp, source_text, translated_text, source_lang, target_lang) "
+        "VALUES (?, ?, ?, ?, ?)"
+    )
+    _SELECT_NEWEST = (
+        "SELECT id, timestamp, source_text, translated_text, source_lang, target_lang "
+        "FROM translations ORDER BY id DESC LIMIT ?"
+    )
+    _SELECT_PAGE = (
+        "SELECT id, timestamp, source_text, translated_text, source_lang, target_lang "
+        "FROM translations WHERE id < ? ORDER BY id DESC LIMIT ?"
+    )
+    _DELETE_AT = (
+        "DELETE FROM translations WHERE id = "
+        "(SELECT id FROM translations ORDER BY id DESC LIMIT 1 OFFSET ?)"
+    )
+    _DELETE_ID = "DELETE FROM translations WHERE id = ?"
+    _DELETE_MATCHING = (
+        "DELETE FROM translations WHERE id = "
+        "(SELECT id FROM translations WHERE timestamp = ? AND source_text = ? AND translated_text = ? "
+        "AND source_lang = ? AND target_lang = ? ORDER BY id DESC LIMIT 1)"
+    )
+    _CLEAR = "DELETE FROM translations"
+
+    def __init__(self, file_path='translations.db', legacy_path='translations.json'):
+        self.file_path = file_path
+        self.legacy_path = legacy_path
+        self._lock = Lock()
+        is_new = not os.path.exists(file_path)
+        self._conn = sqlite3.connect(file_path, check_same_thread=False, cached_statements=64)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for statement in self._SCHEMA:
+                self._conn.execute(statement)
+        if is_new:
+            self._migrate_legacy()
+
+    def _migrate_legacy(self):
+        #one-time import of the old json array (newest first)
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        translations = _load_legacy_json(self.legacy_path)
+        if translations is None:
+            return
+        with self._conn:
+            self._conn.executemany(self._INSERT, (
+                (e['timestamp'], e['source_text'], e['translated_text'], e['source_lang'], e['target_lang'])
+                for e in reversed(translations)
+            ))
+        os.replace(self.legacy_path, self.legacy_path + '.migrated')
+
+    def save_translation(self, source_text, translated_text, source_lang, target_lang):
+
+        if not translated_text.strip():
+            return
+
+        self.save_batch([_new_record(source_text, translated_text, source_lang, target_lang)])
+
+    def save_batch(self, records):
+        #records oldest first; a single transaction
+        with self._lock, self._conn:
+            self._conn.executemany(self._INSERT, (
+                (r['timestamp'], r['source_text'], r['translated_text'], r['source_lang'], r['target_lang'])
+                for r in records
+            ))
+
+    def get_translations(self, limit=50):
+        with self._lock:
+            rows = self._conn.execute(self._SELECT_NEWEST, (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_page(self, cursor=None, limit=50):
+        #keyset pagination: cursor is the id of the last entry already returned
+        with self._lock:
+            if cursor is None:
+                rows = self._conn.execute(self._SELECT_NEWEST, (limit + 1,)).fetchall()
+            else:
+                rows = self._conn.execute(self._SELECT_PAGE, (cursor, limit + 1)).fetchall()
+        entries = [dict(row) for row in rows[:limit]]
+        next_cursor = entries[-1]['id'] if len(rows) > limit else None
+        return entries, next_cursor
+
+    def delete_translation(self, index):
+        if index < 0:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(self._DELETE_AT, (index,))
+
+    def delete_entry(self, entry):
+        #by id, or by content for an entry read before it was written
+        with self._lock, self._conn:
+            if entry.get('id') is not None:
+                self._conn.execute(self._DELETE_ID, (entry['id'],))
+            else:
+                self._conn.execute(self._DELETE_MATCHING, tuple(entry.get(f) for f in _ENTRY_FIELDS))
+
+    def clear_translations(self):
+        with self._lock, self._conn:
+            self._conn.execute(self._CLEAR)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class WriteBehindStorage:
+    """
+    Write-behind queue in front of any of the storages above.
+    save_translation() only queues the record in memory; a background
+    thread writes the queue out with one save_batch() every
+    `flush_interval` seconds, or as soon as `flush_at` records are waiting,
+    and close() writes out the rest. Reads, deletes and clears see queued
+    records as the newest part of the history, so callers get the same
+    view as with the wrapped storage. A failed write keeps the records
+    queued for the next attempt.
+    """
+
+    def __init__(self, storage, flush_interval=2.0, flush_at=32):
+        self.storage = storage
+        self.flush_interval = flush_interval
+        self.flush_at = flush_at
+        self.flushed = 0
+        self._pending = []  # records oldest first, not written yet
+        self._lock = Lock()  # guards _pending
+        self._io_lock = Lock()  # flushes vs reads/deletes of the wrapped storage
+        self._wakeup = Event()
+        self._thread = None
+        self._closing = False
+
+    def save_translation(self, source_text, translated_text, source_lang, target_lang):
+
+        if not translated_text.strip():
+            return
+
+        record = _new_record(source_text, translated_text, source_lang, target_lang)
+        with self._lock:
+            self._pending.append(record)
+            waiting = len(self._pending)
+            if self._thread is None and not self._closing:
+                self._thread = Thread(target=self._loop, name='history-writer', daemon=True)
+                self._thread.start()
+        if waiting >= self.flush_at:
+            self._wakeup.set()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        with self._io_lock:
+            with self._lock:
+                batch = list(self._pending)
+            if not batch:
+                return
+            try:
+                self.storage.save_batch(batch)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Failed to save history: {e}")
+                return
+            with self._lock:
+                #only appends can happen meanwhile, deletes wait for _io_lock
+                del self._pending[:len(batch)]
+            self.flushed += len(batch)
+
+    def get_translations(self, limit=50):
+        return self.get_page(None, limit)[0][:limit]
+
+    def get_page(self, cursor=None, limit=50):
+        #the first page starts with every queued record; later pages come
+        #from the wrapped storage, whose cursors are not moved by the flushes
+        if cursor is not None:
+            return self.storage.get_page(cursor, limit)
+        with self._io_lock:
+            with self._lock:
+                queued = [dict(record) for record in reversed(self._pending)]
+            entries, next_cursor = self.storage.get_page(None, max(1, limit - len(queued)))
+        return queued + entries, next_cursor
+
+    def delete_translation(self, index):
+        if index < 0:
+            return
+        with self._io_lock:
+            with self._lock:
+                if index < len(self._pending):
+                    del self._pending[len(self._pending) - 1 - index]
+                    return
+                index -= len(self._pending)
+            self.storage.delete_translation(index)
+
+    def delete_entry(self, entry):
+        with self._io_lock:
+            with self._lock:
+                for i in range(len(self._pending) - 1, -1, -1):
+                    if _same_entry(self._pending[i], entry):
+                        del self._pending[i]
+                        return
+            self.storage.delete_entry(entry)
+
+    def clear_translations(self):
+        with self._io_lock:
+            with self._lock:
+                self._pending.clear()
+            self.storage.clear_translations()
+
+    def close(self):
+        with self._lock:
+            self._closing = True
+            thread = self._thread
+        if thread is not None:
+            self._wakeup.set()
+            thread.join()
+        self.flush()
+        self.storage.close()
+
+    def _loop(self):
+        while not self._closing:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+STORAGE_BACKENDS = {
+    'json': TranslationsStorage,
+    'log': AppendOnlyTranslationsStorage,
+    'sqlite': SQLiteTranslationsStorage,
+}
+
+
+def open_storage(backend='log', **kwargs):
+    try:
+        storage_cls = STORAGE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    return storage_cls(**kwargs)
@@ -0,0 +1,147 @@
+# services/telemetry.py
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from services.debounce import percentile
+
+#telemetry file path, or 'off'
+ENV_VAR = 'TRANSLATOR_TELEMETRY'
+DEFAULT_PATH = 'telemetry.jsonl'
+
+
+class TelemetryLog:
+    """
+    Structured per-request events (one JSON object per line) for
+    translation and TTS calls. record() only appends to an in-memory
+    buffer; a background thread writes the buffer out every
+    `flush_interval` seconds or once `flush_at` events are waiting, and
+    rotates the file past `max_bytes` (path.1 .. path.<backups>). If the
+    writer falls behind, the oldest buffered events are dropped.
+    Rolling latency/hit statistics over the last `window` events of each
+    kind are kept in memory for summary(), also when the file is off.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=5 * 1024 * 1024, backups=3,
+                 flush_interval=1.0, flush_at=200, max_buffer=10_000, window=200):
+        self.path = path
+        self.enabled = bool(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.flush_at = flush_at
+        self.dropped = 0
+        self._buffer = deque(maxlen=max_buffer)
+        self._recent = {}  # event kind -> deque of recent events
+        self._window = window
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._file = None
+        self._closing = False
+
+    @classmethod
+    def from_env(cls):
+        path = os.environ.get(ENV_VAR, DEFAULT_PATH)
+        return cls(None if path.lower() in ('', '0', 'off') else path)
+
+    def record(self, event, **fields):
+        #cheap and thread-safe; never touches the disk
+        entry = {'ts': round(time.time(), 3), 'event': event}
+        entry.update(fields)
+        with self._lock:
+            recent = self._recent.get(event)
+            if recent is None:
+                recent = self._recent[event] = deque(maxlen=self._window)
+            recent.append(entry)
+            if not self.enabled or self._closing:
+                return
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(entry)
+            waiting = len(self._buffer)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name='telemetry', daemon=True)
+                self._thread.start()
+        if waiting >= self.flush_at:
+            self._wakeup.set()
+
+    def summary(self, event):
+        """
+        Rolling figures for one event kind: count, p50/p95 latency of calls
+        that went to the network, share of calls answered from a cache
+        (hit != 'network') and share of errors.
+        """
+        with self._lock:
+            recent = list(self._recent.get(event, ()))
+        if not recent:
+            return None
+        network = [e['latency_ms'] for e in recent if e.get('hit') == 'network' and not e.get('error')]
+        hits = sum(1 for e in recent if e.get('hit') not in (None, 'network'))
+        errors = sum(1 for e in recent if e.get('error'))
+        return {
+            'count': len(recent),
+            'p50_ms': round(percentile(network, 50)) if network else None,
+            'p95_ms': round(percentile(network, 95)) if network else None,
+            'hit_rate': hits / len(recent),
+            'error_rate': errors / len(recent),
+        }
+
+    def flush(self):
+        with self._lock:
+            events = list(self._buffer)
+            self._buffer.clear()
+        if not events:
+            return
+        data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events).encode('utf-8')
+        try:
+            self._write(data)
+        except OSError as e:
+            print(f"Failed to write telemetry: {e}")
+
+    def close(self):
+        #writes out what is buffered; later events are only counted in memory
+        with self._lock:
+            self._closing = True
+            thread = self._thread
+        if thread is not None:
+            self._wakeup.set()
+            thread.join(timeout=2)
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _loop(self):
+        while not self._closing:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _write(self, data):
+        #writer thread (or close() after it has stopped)
+        if self._file is None:
+            self._file = open(self.path, 'ab')
+        if self._file.tell() and self._file.tell() + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, 'ab')
+
+
+#process-wide log shared by the gui, batch and services
+telemetry = TelemetryLog.from_env()
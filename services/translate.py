@@ -1,30 +1,269 @@
 # services/translate.py
 
-from PySide6.QtCore import QThread, Signal
-from deep_translator import GoogleTranslator
+import itertools
+import queue
+import threading
+import time
+from functools import partial
 
-class TranslatorThread(QThread):
-    #translate thread
-    finished = Signal(str, Exception)
+from PySide6.QtCore import QObject, QTimer, Signal
 
-    def __init__(self, text, source_lang, target_lang):
-        super().__init__()
+from services.detect import AUTO_DETECT
+from services.engine import get_engine
+
+
+def translate_text(text, source_lang, target_lang):
+    #blocking translate call, shared by gui workers and other callers;
+    #goes through the pooled asyncio engine
+    if not text.strip():
+        return ""
+    return get_engine().translate(text, source_lang, target_lang)
+
+
+class TranslationJob:
+    def __init__(self, generation, text, source_lang, target_lang):
+        self.generation = generation
         self.text = text
         self.source_lang = source_lang
         self.target_lang = target_lang
+        self.submitted_at = time.monotonic()
+        self.detected_lang = None  # set when source_lang is 'auto'
+        self.streamed = False  # partial output delivered
+
+
+class TranslationWorkerPool(QObject):
+    """
+    Long-lived translation workers fed from a queue.
+    Every submit() gets a new generation number and makes all older jobs
+    stale: queued stale jobs are skipped, and results of stale or timed out
+    jobs are dropped before `finished` is emitted. Threads are never killed -
+    a job past its timeout is reported as failed and its worker is replaced
+    while the late call runs out on its own.
+    Jobs with source 'auto' are run through `detector` (local, offline)
+    in the worker before the translate call.
+    With `streaming`, translate also gets progress= and cancelled=
+    callbacks (see IncrementalTranslator); partial output of the current
+    job goes out through `progress` and keeps its timeout from firing.
+    `suggest(text, source, target)`, if given, runs on a thread of its own
+    next to the request; a result other than None goes out through
+    `suggestion` as a provisional answer, unless the real one (or partial
+    output) came first.
+    """
+
+    finished = Signal(str, object, object)  # translated text, exception, job
+    progress = Signal(str, object)  # translated part so far, job
+    suggestion = Signal(object, object)  # suggest() result, job
+    _result = Signal(object, str, object)  # job, translated text, exception (worker -> gui)
+    _partial = Signal(object, str)  # job, translated part (worker -> gui)
+    _suggested = Signal(object, object)  # job, suggest() result (worker -> gui)
+
+    def __init__(self, workers=2, timeout=10.0, translate=translate_text, detector=None,
+                 streaming=False, suggest=None, parent=None):
+        super().__init__(parent)
+        self.translate = translate
+        self.detector = detector
+        self.streaming = streaming
+        self.suggest = suggest
+        self.size = workers
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._generations = itertools.count(1)
+        self._latest = None  # job waiting for a result
+        self._lock = threading.Lock()
+        self._alive = 0
+        self._busy = 0
+        self._stopping = False
+
+        self._timeout_timer = QTimer(self)
+        self._timeout_timer.setSingleShot(True)
+        self._timeout_timer.timeout.connect(self._on_timeout)
+        self._result.connect(self._deliver)
+        self._partial.connect(self._deliver_partial)
+        self._suggested.connect(self._deliver_suggestion)
+
+        for _ in range(workers):
+            self._spawn_worker()
+        self._suggest_queue = queue.Queue()
+        if suggest is not None:
+            threading.Thread(target=self._suggest_work, name='translate-suggest', daemon=True).start()
+
+    def submit(self, text, source_lang, target_lang):
+        job = TranslationJob(next(self._generations), text, source_lang, target_lang)
+        self._latest = job
+        self._queue.put(job)
+        if self.suggest is not None:
+            self._suggest_queue.put(job)
+        self._timeout_timer.start(int(self.timeout * 1000))
+        return job
+
+    def cancel(self):
+        #forget the pending job; its result will be dropped
+        self._latest = None
+        self._timeout_timer.stop()
+
+    def is_pending(self):
+        return self._latest is not None
+
+    def shutdown(self):
+        self.cancel()
+        self._stopping = True
+        with self._lock:
+            alive = self._alive
+        for _ in range(alive):
+            self._queue.put(None)
+        self._suggest_queue.put(None)
+
+    def _spawn_worker(self):
+        with self._lock:
+            self._alive += 1
+        threading.Thread(target=self._work, daemon=True).start()
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None or self._stopping:
+                break
+            if job is not self._latest:
+                continue  # superseded while queued
+
+            with self._lock:
+                self._busy += 1
+            try:
+                source_lang = self._source_lang(job)
+                if self.streaming:
+                    translated = self.translate(
+                        job.text, source_lang, job.target_lang,
+                        progress=lambda text, job=job: self._partial.emit(job, text),
+                        cancelled=lambda job=job: job is not self._latest,
+                    )
+                else:
+                    translated = self.translate(job.text, source_lang, job.target_lang)
+                error = None
+                if job.detected_lang and self.detector is not None:
+                    self.detector.confirm(job.detected_lang)
+            except Exception as e:
+                translated, error = "", e
+            with self._lock:
+                self._busy -= 1
+                retire = self._alive > self.size
+                if retire:
+                    self._alive -= 1
 
-    def run(self):
-        try:
-            if not self.text.strip():
-                self.finished.emit("", None)
+            if not self._stopping:
+                self._result.emit(job, translated, error)
+            if retire:
                 return
-            
-            translator = GoogleTranslator(
-                source=self.source_lang,
-                target=self.target_lang
-            )
-            translated = translator.translate(self.text)
-            self.finished.emit(translated, None)
-
-        except Exception as e:
-            self.finished.emit("", e)
+
+        with self._lock:
+            self._alive -= 1
+
+    def _source_lang(self, job):
+        #detection is memoized, the suggest thread and the worker share it
+        if job.source_lang != AUTO_DETECT or self.detector is None:
+            return job.source_lang
+        job.detected_lang = self.detector.detect(job.text)
+        return job.detected_lang or AUTO_DETECT
+
+    def _suggest_work(self):
+        while True:
+            job = self._suggest_queue.get()
+            if job is None or self._stopping:
+                break
+            if job is not self._latest:
+                continue
+            try:
+                suggested = self.suggest(job.text, self._source_lang(job), job.target_lang)
+            except Exception as e:
+                print(f"Suggestion failed: {e}")
+                continue
+            if suggested is not None:
+                self._suggested.emit(job, suggested)
+
+    def _deliver(self, job, translated, error):
+        #gui thread: only the current job gets through
+        if job is not self._latest:
+            return
+        self._latest = None
+        self._timeout_timer.stop()
+        self.finished.emit(translated, error, job)
+
+    def _deliver_partial(self, job, text):
+        if job is not self._latest:
+            return
+        #still making progress - give it another timeout period
+        self._timeout_timer.start(int(self.timeout * 1000))
+        job.streamed = True
+        self.progress.emit(text, job)
+
+    def _deliver_suggestion(self, job, suggested):
+        if job is not self._latest or job.streamed:
+            return
+        self.suggestion.emit(suggested, job)
+
+    def _on_timeout(self):
+        job = self._latest
+        if job is None:
+            return
+        self._latest = None
+        #the worker stays blocked on the late call - add one so capacity holds
+        with self._lock:
+            starved = self._busy >= self._alive
+        if starved:
+            self._spawn_worker()
+        self.finished.emit("", TimeoutError(f"no response in {self.timeout:g} s"), job)
+
+
+class MultiTargetTranslator(QObject):
+    """
+    One source text into several target languages at once, one engine
+    request per target (identical in-flight requests share one).
+    Results go out through `result` as each target finishes, in any order;
+    a new translate() call drops whatever the previous one has not
+    delivered yet. `lookup(text, source, target)` is tried first - a hit
+    is delivered right away without a request.
+    """
+
+    result = Signal(int, str, str, object)  # generation, target lang, text, exception
+    _done = Signal(int, str, str, object)  # same, engine thread -> gui
+
+    def __init__(self, lookup=None, parent=None):
+        super().__init__(parent)
+        self.lookup = lookup
+        self.generation = 0
+        self._pending = set()
+        self._done.connect(self._deliver)
+
+    def translate(self, text, source_lang, targets):
+        self.generation += 1
+        generation = self.generation
+        self._pending = set()
+        for target in targets:
+            if target == source_lang:
+                self.result.emit(generation, target, text.strip(), None)
+                continue
+            found = self.lookup(text, source_lang, target) if self.lookup else None
+            if found is not None:
+                self.result.emit(generation, target, found, None)
+                continue
+            self._pending.add(target)
+            future = get_engine().submit(text, source_lang, target)
+            future.add_done_callback(partial(self._on_future_done, generation, target))
+        return generation
+
+    def cancel(self):
+        self.generation += 1
+        self._pending = set()
+
+    def pending(self):
+        return len(self._pending)
+
+    def _on_future_done(self, generation, target, future):
+        #engine loop thread
+        error = future.exception()
+        self._done.emit(generation, target, "" if error else future.result(), error)
+
+    def _deliver(self, generation, target, text, error):
+        if generation != self.generation:
+            return
+        self._pending.discard(target)
+        self.result.emit(generation, target, text, error)
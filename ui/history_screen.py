@@ -1,13 +1,238 @@
 # -*- coding: utf-8 -*-
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QScrollArea, QFrame, QPlainTextEdit
+    QPushButton, QListView, QStyledItemDelegate, QAbstractItemView
+)
+from PySide6.QtGui import QIcon, QCursor, QColor, QPen, QPainter
+from PySide6.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, QThread, Signal
 )
-from PySide6.QtGui import QIcon, QCursor
-from PySide6.QtCore import Qt
 
 from constants import UI_TRANSLATIONS, LANGUAGES
-from services.speak import speak_text
+
+EntryRole = Qt.UserRole + 1
+
+
+class HistoryPageLoader(QThread):
+    #reads one page of history off the GUI thread
+    page_loaded = Signal(object, object, int)  # entries, next cursor, model generation
+
+    def __init__(self, storage, cursor, limit, generation):
+        super().__init__()
+        self.storage = storage
+        self.cursor = cursor
+        self.limit = limit
+        self.generation = generation
+
+    def run(self):
+        try:
+            entries, next_cursor = self.storage.get_page(self.cursor, self.limit)
+        except Exception as e:
+            print(f"Failed to load history page: {e}")
+            entries, next_cursor = [], None
+        self.page_loaded.emit(entries, next_cursor, self.generation)
+
+
+class HistoryModel(QAbstractListModel):
+    """
+    History entries (dicts from storage), newest first, loaded page by page.
+    The first page is read synchronously; further pages are fetched in the
+    background when the view asks for more (canFetchMore/fetchMore).
+    """
+
+    PAGE_SIZE = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries = []
+        self._storage = None
+        self._cursor = None
+        self._has_more = False
+        self._fetching = False
+        self._loaders = set()  # keep running threads referenced until they finish
+        self._generation = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._entries):
+            return None
+        entry = self._entries[index.row()]
+        if role == EntryRole:
+            return entry
+        if role == Qt.DisplayRole:
+            return entry['source_text']
+        return None
+
+    def reload(self, storage):
+        #drop everything and read the first page
+        self._generation += 1
+        self._fetching = False
+        self._storage = storage
+        entries, self._cursor = storage.get_page(None, self.PAGE_SIZE)
+        self._has_more = self._cursor is not None
+        self.beginResetModel()
+        self._entries = list(entries)
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._has_more and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._fetching = True
+        loader = HistoryPageLoader(self._storage, self._cursor, self.PAGE_SIZE, self._generation)
+        loader.page_loaded.connect(self._on_page_loaded)
+        loader.finished.connect(lambda: self._loaders.discard(loader))
+        self._loaders.add(loader)
+        loader.start()
+
+    def _on_page_loaded(self, entries, next_cursor, generation):
+        if generation != self._generation:
+            return  # model was reloaded meanwhile
+        self._fetching = False
+        self._cursor = next_cursor
+        self._has_more = next_cursor is not None
+        if entries:
+            first = len(self._entries)
+            self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+            self._entries.extend(entries)
+            self.endInsertRows()
+
+    def remove_row(self, row):
+        if not 0 <= row < len(self._entries):
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._entries[row]
+        self.endRemoveRows()
+
+
+class HistoryItemDelegate(QStyledItemDelegate):
+    """
+    Paints a history card per row instead of building widgets for it.
+    Only rows in the viewport are ever painted; clicks on the painted
+    buttons are hit-tested here and reported through action_triggered.
+    """
+
+    action_triggered = Signal(str, int)  # action, row
+
+    ROW_HEIGHT = 182
+    BUTTON_SIZE = 22
+    TEXT_BOX_HEIGHT = 80
+    MAX_PAINTED_CHARS = 1000
+
+    _icons = {}
+
+    def __init__(self, app, parent=None):
+        super().__init__(parent)
+        self.app = app  # link at TranslatorApp
+
+    @classmethod
+    def _icon(cls, name):
+        #icons are shared by all rows
+        icon = cls._icons.get(name)
+        if icon is None:
+            icon = cls._icons[name] = QIcon(f"icons/{name}.svg")
+        return icon
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def _layout(self, rect):
+        b = self.BUTTON_SIZE
+        card = rect.adjusted(4, 5, -4, -5)
+        inner = card.adjusted(10, 10, -10, -10)
+        col_w = (inner.width() - 10) // 2
+        text_top = inner.top() + b + 4 + 18 + 4
+        btn_top = text_top + self.TEXT_BOX_HEIGHT + 4
+
+        src_left = inner.left()
+        tgt_left = inner.left() + col_w + 10
+        return {
+            'card': card,
+            'langs': QRect(inner.left(), inner.top(), inner.width() - b - 6, b),
+            'delete': QRect(inner.right() - b + 1, inner.top(), b, b),
+            'time': QRect(inner.left(), inner.top() + b + 4, inner.width(), 18),
+            'src_text': QRect(src_left, text_top, col_w, self.TEXT_BOX_HEIGHT),
+            'tgt_text': QRect(tgt_left, text_top, col_w, self.TEXT_BOX_HEIGHT),
+            'src_speak': QRect(src_left, btn_top, b, b),
+            'src_copy': QRect(src_left + b + 4, btn_top, b, b),
+            'tgt_speak': QRect(tgt_left, btn_top, b, b),
+            'tgt_copy': QRect(tgt_left + b + 4, btn_top, b, b),
+        }
+
+    def paint(self, painter, option, index):
+        entry = index.data(EntryRole)
+        if entry is None:
+            return
+        rects = self._layout(option.rect)
+        interface_lang = self.app.current_interface_lang
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        #card
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor('#f5f5f5'))
+        painter.drawRoundedRect(rects['card'], 8, 8)
+
+        #langs && time
+        src_name = LANGUAGES.get(entry['source_lang'], {}).get(interface_lang, entry['source_lang'])
+        tgt_name = LANGUAGES.get(entry['target_lang'], {}).get(interface_lang, entry['target_lang'])
+        painter.setPen(option.palette.color(option.palette.ColorRole.Text))
+        painter.drawText(rects['langs'], Qt.AlignLeft | Qt.AlignVCenter, f"{src_name} → {tgt_name}")
+        painter.setPen(QColor('#666'))
+        painter.drawText(rects['time'], Qt.AlignLeft | Qt.AlignVCenter, entry['timestamp'])
+
+        #texts
+        for key, text in (('src_text', entry['source_text']), ('tgt_text', entry['translated_text'])):
+            box = rects[key]
+            painter.setPen(QPen(QColor('#d0d0d0')))
+            painter.setBrush(QColor('white'))
+            painter.drawRect(box)
+            painter.setPen(option.palette.color(option.palette.ColorRole.Text))
+            painter.setClipRect(box.adjusted(1, 1, -1, -1))
+            painter.drawText(
+                box.adjusted(6, 4, -6, -4),
+                Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap,
+                text[:self.MAX_PAINTED_CHARS]
+            )
+            painter.setClipping(False)
+
+        #buttons
+        for key, icon in (('delete', 'trash'), ('src_speak', 'speaker'), ('src_copy', 'copy'),
+                          ('tgt_speak', 'speaker'), ('tgt_copy', 'copy')):
+            self._icon(icon).paint(painter, rects[key].adjusted(3, 3, -3, -3))
+
+        painter.restore()
+
+    def _hit(self, rect, pos):
+        rects = self._layout(rect)
+        for key in ('delete', 'src_speak', 'src_copy', 'tgt_speak', 'tgt_copy'):
+            if rects[key].contains(pos):
+                return key
+        return None
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseMove:
+            view = self.parent()
+            hit = self._hit(option.rect, event.position().toPoint())
+            if view is not None:
+                view.viewport().setCursor(QCursor(Qt.PointingHandCursor if hit else Qt.ArrowCursor))
+            return False
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            hit = self._hit(option.rect, event.position().toPoint())
+            if hit:
+                self.action_triggered.emit(hit, index.row())
+                return True
+        return False
+
 
 class HistoryScreen(QWidget):
     def __init__(self, parent):
@@ -23,14 +248,14 @@ class HistoryScreen(QWidget):
         self.title_label = QLabel(UI_TRANSLATIONS[self.parent.current_interface_lang]['history_title'])
         self.title_label.setStyleSheet("font-size: 18px; font-weight: bold;")
         top_bar.addWidget(self.title_label)
-        
+
         self.clear_btn = QPushButton(UI_TRANSLATIONS[self.parent.current_interface_lang]['clear_history'])
         self.clear_btn.setIcon(QIcon("icons/trash.svg"))
         self.clear_btn.clicked.connect(self.parent.clear_history)
         self.clear_btn.setEnabled(False)
         self.clear_btn.setCursor(QCursor(Qt.PointingHandCursor))
         top_bar.addWidget(self.clear_btn)
-        
+
         close_btn = QPushButton()
         close_btn.setIcon(QIcon("icons/close.svg"))
         close_btn.setFixedSize(26, 26)
@@ -40,153 +265,68 @@ class HistoryScreen(QWidget):
 
         self.layout.addLayout(top_bar)
 
-        #scroll
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-
-        self.container = QWidget()
-        self.container_layout = QVBoxLayout(self.container)
-        self.container_layout.setAlignment(Qt.AlignTop)
-        self.container_layout.setSpacing(10)
+        #list (model/view, rows painted by delegate)
+        self.model = HistoryModel(self)
+        self.view = QListView()
+        self.view.setModel(self.model)
+        self.delegate = HistoryItemDelegate(self.parent, self.view)
+        self.delegate.action_triggered.connect(self._on_action)
+        self.view.setItemDelegate(self.delegate)
+        self.view.setUniformItemSizes(True)
+        self.view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.view.setMouseTracking(True)
+        self.view.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        self.layout.addWidget(self.view)
 
         #if no history - default (no history)
         self.empty_label = QLabel(UI_TRANSLATIONS[self.parent.current_interface_lang]['no_history'])
         self.empty_label.setStyleSheet("color: #666; font-size: 14px;")
         self.empty_label.setAlignment(Qt.AlignCenter)
-        self.container_layout.addWidget(self.empty_label)
+        self.layout.addWidget(self.empty_label)
         self.empty_label.hide()
 
-        scroll.setWidget(self.container)
-        self.layout.addWidget(scroll)
-
     def update_texts(self):
         t = UI_TRANSLATIONS[self.parent.current_interface_lang]
         self.title_label.setText(t['history_title'])
         self.clear_btn.setText(t['clear_history'])
         self.empty_label.setText(t['no_history'])
-        
-        #update history
-        self.load_history()
+
+        #repaint rows with new language names
+        self.view.viewport().update()
 
     def load_history(self):
-        #delete all cards
-        for i in reversed(range(self.container_layout.count())):
-            widget = self.container_layout.itemAt(i).widget()
-            if widget and widget != self.empty_label:
-                widget.deleteLater()
-
-        translations = self.parent.storage.get_translations(50)
-        has_data = len(translations) > 0
-        self.empty_label.setVisible(not has_data)
-        self.clear_btn.setEnabled(has_data)
+        self.model.reload(self.parent.storage)
+        self._update_empty_state()
 
-        if not has_data:
-            return
+    def _on_scrolled(self, value):
+        #start loading the next page a few rows before the end
+        bar = self.view.verticalScrollBar()
+        if bar.maximum() - value < 3 * HistoryItemDelegate.ROW_HEIGHT and self.model.canFetchMore():
+            self.model.fetchMore()
 
-        #current interface lang
-        interface_lang = self.parent.current_interface_lang
-
-        for idx, entry in enumerate(translations):
-            card = QFrame()
-            card.setObjectName("historyCard")
-            card.setStyleSheet("""
-                #historyCard {
-                    background-color: #f5f5f5;
-                    border-radius: 8px;
-                    padding: 10px;
-                }
-            """)
-            card_layout = QVBoxLayout(card)
-
-            #top string
-            top = QHBoxLayout()
-            #getting langs
-            src_name = LANGUAGES.get(entry['source_lang'], {}).get(interface_lang, entry['source_lang'])
-            tgt_name = LANGUAGES.get(entry['target_lang'], {}).get(interface_lang, entry['target_lang'])
-            lang_label = QLabel(f"{src_name} → {tgt_name}")
-            top.addWidget(lang_label)
-            top.addStretch(1)
-            del_btn = QPushButton()
-            del_btn.setIcon(QIcon("icons/trash.svg"))
-            del_btn.setFixedSize(22, 22)
-            del_btn.clicked.connect(lambda _, i=idx: self.parent.delete_translation(i))
-            del_btn.setCursor(QCursor(Qt.PointingHandCursor))
-
-            top.addWidget(del_btn)
-            top.addStretch()
-
-            card_layout.addLayout(top)
-
-            #time
-            time_label = QLabel(entry['timestamp'])
-            time_label.setStyleSheet("color: #666;")
-            card_layout.addWidget(time_label)
-
-            #texts
-            texts_layout = QHBoxLayout()
-
-            #from text
-            src_panel = QVBoxLayout()
-            src_text = QPlainTextEdit()
-            src_text.setPlainText(entry['source_text'])
-            src_text.setReadOnly(True)
-            src_text.setMaximumHeight(80)
-            src_panel.addWidget(src_text)
-
-            src_btns = QHBoxLayout()
-            src_speak_btn = QPushButton()
-            src_speak_btn.setIcon(QIcon("icons/speaker.svg"))
-            src_speak_btn.setFixedSize(22, 22)
-            src_speak_btn.clicked.connect(
-                lambda _, txt=entry['source_text'], lang=entry['source_lang']: speak_text(txt, lang)
-            )
-            src_speak_btn.setCursor(QCursor(Qt.PointingHandCursor))
-            src_btns.addWidget(src_speak_btn)
-
-            src_copy_btn = QPushButton()
-            src_copy_btn.setIcon(QIcon("icons/copy.svg"))
-            src_copy_btn.setFixedSize(22, 22)
-            src_copy_btn.clicked.connect(
-                lambda _, txt=entry['source_text']: self.parent.copy_to_clipboard(txt)
-            )
-            src_copy_btn.setCursor(QCursor(Qt.PointingHandCursor))
-            src_btns.addWidget(src_copy_btn)
-            src_btns.addStretch(1)
-
-            src_panel.addLayout(src_btns)
-            texts_layout.addLayout(src_panel)
-
-            #result text
-            tgt_panel = QVBoxLayout()
-            tgt_text = QPlainTextEdit()
-            tgt_text.setPlainText(entry['translated_text'])
-            tgt_text.setReadOnly(True)
-            tgt_text.setMaximumHeight(80)
-            tgt_panel.addWidget(tgt_text)
-
-            tgt_btns = QHBoxLayout()
-            tgt_speak_btn = QPushButton()
-            tgt_speak_btn.setIcon(QIcon("icons/speaker.svg"))
-            tgt_speak_btn.setFixedSize(22, 22)
-            tgt_speak_btn.clicked.connect(
-                lambda _, txt=entry['translated_text'], lang=entry['target_lang']: speak_text(txt, lang)
-            )
-            tgt_speak_btn.setCursor(QCursor(Qt.PointingHandCursor))
-            tgt_btns.addWidget(tgt_speak_btn)
-
-            tgt_copy_btn = QPushButton()
-            tgt_copy_btn.setIcon(QIcon("icons/copy.svg"))
-            tgt_copy_btn.setFixedSize(22, 22)
-            tgt_copy_btn.clicked.connect(
-                lambda _, txt=entry['translated_text']: self.parent.copy_to_clipboard(txt)
-            )
-            tgt_copy_btn.setCursor(QCursor(Qt.PointingHandCursor))
-            tgt_btns.addWidget(tgt_copy_btn)
-            tgt_btns.addStretch(1)
+    def remove_entry(self, row):
+        self.model.remove_row(row)
+        self._update_empty_state()
 
-            tgt_panel.addLayout(tgt_btns)
-            texts_layout.addLayout(tgt_panel)
+    def _update_empty_state(self):
+        has_data = self.model.rowCount() > 0
+        self.empty_label.setVisible(not has_data)
+        self.view.setVisible(has_data)
+        self.clear_btn.setEnabled(has_data)
 
-            card_layout.addLayout(texts_layout)
-            self.container_layout.addWidget(card)
\ No newline at end of file
+    def _on_action(self, action, row):
+        entry = self.model.index(row).data(EntryRole)
+        if entry is None:
+            return
+        if action == 'delete':
+            self.parent.delete_translation(row)
+        elif action == 'src_speak':
+            self.parent.playback.speak(entry['source_text'], entry['source_lang'])
+        elif action == 'tgt_speak':
+            self.parent.playback.speak(entry['translated_text'], entry['target_lang'])
+        elif action == 'src_copy':
+            self.parent.copy_to_clipboard(entry['source_text'])
+        elif action == 'tgt_copy':
+            self.parent.copy_to_clipboard(entry['translated_text'])
@@ -1,12 +1,148 @@
 # -*- coding: utf-8 -*-
+from functools import lru_cache
+
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QLineEdit, QListWidget, QListWidgetItem
+    QPushButton, QLineEdit, QListView, QAbstractItemView
 )
 from PySide6.QtGui import QIcon, QCursor
-from PySide6.QtCore import Qt
+from PySide6.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QItemSelectionModel
+)
+
+from constants import UI_TRANSLATIONS, LANGUAGES, AUTO_DETECT, language_name
+
+CodeRole = Qt.UserRole
+
+
+@lru_cache(maxsize=None)
+def language_index(interface_lang, with_auto=False):
+    """
+    (code, display name, lowercase search keys) sorted by display name,
+    built once per interface language. Keys are the names in every
+    interface language plus the code.
+    """
+    entries = []
+    for code, names in LANGUAGES.items():
+        keys = tuple({name.lower() for name in names.values()} | {code.lower()})
+        entries.append((code, names.get(interface_lang, code), keys))
+    entries.sort(key=lambda entry: entry[1].lower())
+    if with_auto:
+        keys = tuple({language_name(AUTO_DETECT, lang).lower() for lang in UI_TRANSLATIONS} | {AUTO_DETECT})
+        entries.insert(0, (AUTO_DETECT, language_name(AUTO_DETECT, interface_lang), keys))
+    return tuple(entries)
+
+
+def match_score(query, keys):
+    """
+    Rank of the best match of `query` against the search keys, or None.
+    code == query > name prefix > word prefix > substring > fuzzy (letters
+    in order, fewer gaps rank higher).
+    """
+    best = None
+    for key in keys:
+        if key == query:
+            score = 100
+        elif key.startswith(query):
+            score = 90
+        elif any(word.startswith(query) for word in key.replace('(', ' ').split()):
+            score = 80
+        elif query in key:
+            score = 60
+        else:
+            score = _fuzzy_score(query, key)
+        if score is not None and (best is None or score > best):
+            best = score
+    return best
+
+
+def _fuzzy_score(query, key):
+    #subsequence match; 40 minus the letters skipped between matches
+    position, gaps = 0, 0
+    for char in query:
+        found = key.find(char, position)
+        if found < 0:
+            return None
+        if position and found > position:
+            gaps += found - position
+        position = found + 1
+    return max(1, 40 - gaps)
+
+
+class LanguageListModel(QAbstractListModel):
+    #languages in base (alphabetical) order for one interface language
+    def __init__(self, with_auto, parent=None):
+        super().__init__(parent)
+        self.with_auto = with_auto
+        self.entries = ()
+
+    def set_interface_lang(self, interface_lang):
+        entries = language_index(interface_lang, self.with_auto)
+        if entries is self.entries:
+            return
+        self.beginResetModel()
+        self.entries = entries
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        code, name, _ = self.entries[index.row()]
+        if role == Qt.DisplayRole:
+            return name
+        if role == CodeRole:
+            return code
+        return None
+
+
+class LanguageFilterProxy(QSortFilterProxyModel):
+    """
+    Current language first, then - while searching - best matches first;
+    otherwise the base order is kept. Scores are computed once per query.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.current_code = None
+        self._scores = None  # source row -> score, None when not searching
+
+    def set_current(self, code):
+        if code != self.current_code:
+            self.current_code = code
+            self.invalidate()
+
+    def set_query(self, text):
+        query = text.strip().lower()
+        if query:
+            entries = self.sourceModel().entries
+            self._scores = {}
+            for row, (_, _, keys) in enumerate(entries):
+                score = match_score(query, keys)
+                if score is not None:
+                    self._scores[row] = score
+        else:
+            self._scores = None
+        self.invalidate()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self._scores is None or source_row in self._scores
+
+    def lessThan(self, left, right):
+        entries = self.sourceModel().entries
+        left_row, right_row = left.row(), right.row()
+        left_current = entries[left_row][0] == self.current_code
+        right_current = entries[right_row][0] == self.current_code
+        if left_current != right_current:
+            return left_current
+        if self._scores is not None:
+            left_score, right_score = self._scores[left_row], self._scores[right_row]
+            if left_score != right_score:
+                return left_score > right_score
+        return left_row < right_row
 
-from constants import UI_TRANSLATIONS, LANGUAGES
 
 class LanguageSelector(QWidget):
     def __init__(self, parent, target: str): # init langs screen
@@ -44,10 +180,17 @@ class LanguageSelector(QWidget):
         self.search_input.textChanged.connect(self._filter_languages)
         self.layout.addWidget(self.search_input)
 
-        #langs list
-        self.list_widget = QListWidget()
-        self.list_widget.itemClicked.connect(self._select_language)
-        self.layout.addWidget(self.list_widget)
+        #langs list (shared sorted index + filtering/ranking proxy)
+        self.model = LanguageListModel(with_auto=self.target == 'source', parent=self)
+        self.proxy = LanguageFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.sort(0)
+        self.list_view = QListView()
+        self.list_view.setModel(self.proxy)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.clicked.connect(self._select_language)
+        self.layout.addWidget(self.list_view)
 
         #push langs at list
         self.populate_language_list(self._get_current_code())
@@ -62,31 +205,13 @@ class LanguageSelector(QWidget):
         self.populate_language_list(self._get_current_code())
 
     def populate_language_list(self, current_code: str = ""):
-        self.list_widget.clear()
-        
-        #current interface lang
-        interface_lang = self.parent.current_interface_lang
-        
-        #sorting langs
-        sorted_items = sorted(
-            LANGUAGES.items(),
-            key=lambda x: x[1][interface_lang].lower()
-        )
-        #set current lang at start
-        sorted_items = sorted(
-            sorted_items,
-            key=lambda x: x[0] != current_code
-        )
-
-        for code, names in sorted_items:
-            #using correct lang names
-            name = names.get(interface_lang, code)
-            item = QListWidgetItem(name)
-            # item.setCursor(QCursor(Qt.PointingHandCursor))
-            item.setData(Qt.UserRole, code)
-            self.list_widget.addItem(item)
-            if code == current_code:
-                item.setSelected(True)
+        #index for the interface lang is built once; only the current row moves
+        self.model.set_interface_lang(self.parent.current_interface_lang)
+        self.proxy.set_current(current_code)
+        self.list_view.scrollToTop()
+        current = self.proxy.index(0, 0)
+        if current.isValid() and current.data(CodeRole) == current_code:
+            self.list_view.selectionModel().select(current, QItemSelectionModel.ClearAndSelect)
 
     def _get_current_code(self) -> str:
         #return current lang code for target
@@ -96,16 +221,13 @@ class LanguageSelector(QWidget):
             return self.parent.target_lang_code
 
     def _filter_languages(self, text: str):
-        #filter. on input change
-        lower = text.lower()
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            name = item.text().lower()
-            item.setHidden(lower not in name)
-
-    def _select_language(self, item: QListWidgetItem):
+        #filter and rank. on input change
+        self.proxy.set_query(text)
+        self.list_view.scrollToTop()
+
+    def _select_language(self, index: QModelIndex):
         try:
-            code = item.data(Qt.UserRole)
+            code = index.data(CodeRole)
             if code is None:
                 return
             #current lang interface
@@ -115,13 +237,13 @@ class LanguageSelector(QWidget):
                     self.parent.swap_languages()
                 else:
                     self.parent.source_lang_code = code
-                    self.parent.src_btn.setText(LANGUAGES.get(code, {}).get(interface_lang, code))
+                    self.parent.src_btn.setText(language_name(code, interface_lang))
             else:
                 if code == self.parent.source_lang_code:
                     self.parent.swap_languages()
                 else:
                     self.parent.target_lang_code = code
-                    self.parent.tgt_btn.setText(LANGUAGES.get(code, {}).get(interface_lang, code))
+                    self.parent.tgt_btn.setText(language_name(code, interface_lang))
             self.parent.update_speaker_buttons()
             self.parent.stack.setCurrentWidget(self.parent.main_screen)
             self.parent.on_source_text_changed()
@@ -1,3 +1,7 @@
+import os
+import threading
+import time
+
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QPlainTextEdit, QStatusBar, QStackedWidget, QLabel,
@@ -5,17 +9,21 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QIcon, QCursor
 
-import gtts.lang
-
-from constants import UI_TRANSLATIONS, LANGUAGES
-from services.storage import TranslationsStorage
-from services.translate import TranslatorThread
-from services.speak import speak_text
-
-from ui.history_screen import HistoryScreen
-from ui.language_selector import LanguageSelector
-
-gtts_langs = gtts.lang.tts_langs()
+from constants import UI_TRANSLATIONS, AUTO_DETECT, TTS_LANGUAGES, language_name
+from services.cache import TranslationCache
+from services.debounce import AdaptiveDebounce
+from services.detect import LanguageDetector
+from services.memory import TranslationMemory
+from services.engine import circuit_retry_after
+from services.ratelimit import CircuitOpenError
+from services.telemetry import telemetry
+from services.storage import WriteBehindStorage, open_storage
+from services.translate import TranslationWorkerPool
+from services.segments import IncrementalTranslator
+from services.playback import PlaybackService, SpeechPrefetcher
+from services.profiler import startup
+
+gtts_langs = TTS_LANGUAGES
 
 class TranslatorApp(QMainWindow):
     def __init__(self):
@@ -28,38 +36,103 @@ class TranslatorApp(QMainWindow):
         #interface lang
         self.current_interface_lang = 'ru'
 
-        #storage
-        self.storage = TranslationsStorage()
+        #storage ('log', 'sqlite' or 'json'); saves are queued and written
+        #out in batches off the gui thread, the rest on close
+        with startup.phase('storage open'):
+            self.storage = WriteBehindStorage(open_storage(os.environ.get('TRANSLATOR_STORAGE', 'log')))
 
         #timers
         self.translation_timer = QTimer()
         self.translation_timer.setSingleShot(True)
         self.translation_timer.timeout.connect(self.do_translation)
+        self.debounce = AdaptiveDebounce()
+
+        with startup.phase('services'):
+            #text-to-speech, synthesized and played off the gui thread
+            self.playback = PlaybackService(self)
+            self.playback.status.connect(self.show_playback_status)
+
+            #synthesize fresh translations ahead of a click on the speaker
+            self.tts_prefetch_enabled = True
+            self.speech_prefetcher = SpeechPrefetcher(is_busy=self.playback.is_active)
+
+            #translate workers (long-lived, fed from a queue); long texts are
+            #retranslated sentence by sentence, only what changed, in parallel
+            #chunks shown as they arrive
+            self.detector = LanguageDetector()
+            self.detected_lang_code = None  # last detection for the 'auto' source
+            #(near-repeats from the memory are shown while the request runs)
+            self.translation_pool = TranslationWorkerPool(
+                translate=IncrementalTranslator(), detector=self.detector, streaming=True,
+                suggest=self.suggest_from_memory,
+            )
+            self.translation_pool.finished.connect(self.on_translation_finished)
+            self.translation_pool.progress.connect(self.on_translation_progress)
+            self.translation_pool.suggestion.connect(self.on_translation_suggestion)
+
+            #recent translations, checked before any thread is started
+            self.translation_cache = TranslationCache()
 
-        #thread translate 
-        self.translation_thread = None
+            #translation memory: repeats and near-repeats from the history;
+            #indexed in the background, lookups see what is loaded so far
+            self.memory = TranslationMemory(
+                threshold=float(os.environ.get('TRANSLATOR_TM_THRESHOLD', 0.9))
+            )
+            self.memory_match = None  # match shown in target_text, if any
+            self.suggested_job = None  # job whose provisional match is shown
+            threading.Thread(target=self.memory.load, args=(self.storage,), name='tm-load', daemon=True).start()
 
         #screens stack
         self.stack = QStackedWidget()
         self.setCentralWidget(self.stack)
 
         #creating screens
+        #(history and language screens are built on first show)
         self.main_screen = QWidget()
-        self.history_screen = HistoryScreen(self)
-        self.source_lang_selector = LanguageSelector(self, 'source')
-        self.target_lang_selector = LanguageSelector(self, 'target')
+        self._screens = {}
 
         #setting up ui
-        self.setup_main_screen()
-        self.stack.addWidget(self.main_screen)
-        self.stack.addWidget(self.history_screen)
-        self.stack.addWidget(self.source_lang_selector)
-        self.stack.addWidget(self.target_lang_selector)
+        with startup.phase('main screen'):
+            self.setup_main_screen()
+            self.stack.addWidget(self.main_screen)
 
         #main screen as base
         self.stack.setCurrentWidget(self.main_screen)
-        self.update_interface_texts()
-        self.update_speaker_buttons()
+        with startup.phase('update_interface_texts'):
+            self.update_interface_texts()
+            self.update_speaker_buttons()
+
+    def _screen(self, name):
+        screen = self._screens.get(name)
+        if screen is None:
+            if name == 'history':
+                from ui.history_screen import HistoryScreen
+                screen = HistoryScreen(self)
+            elif name == 'multi_target':
+                from ui.multi_target_screen import MultiTargetScreen
+                screen = MultiTargetScreen(self)
+            else:
+                from ui.language_selector import LanguageSelector
+                screen = LanguageSelector(self, name)
+            self._screens[name] = screen
+            self.stack.addWidget(screen)
+        return screen
+
+    @property
+    def history_screen(self):
+        return self._screen('history')
+
+    @property
+    def multi_target_screen(self):
+        return self._screen('multi_target')
+
+    @property
+    def source_lang_selector(self):
+        return self._screen('source')
+
+    @property
+    def target_lang_selector(self):
+        return self._screen('target')
 
     def setup_main_screen(self):
         self.setWindowTitle(UI_TRANSLATIONS[self.current_interface_lang]['window_title'])
@@ -73,7 +146,7 @@ class TranslatorApp(QMainWindow):
         lang_panel = QHBoxLayout()
         lang_panel.addStretch()
 
-        self.src_btn = QPushButton(LANGUAGES[self.source_lang_code][self.current_interface_lang])
+        self.src_btn = QPushButton(language_name(self.source_lang_code, self.current_interface_lang))
         self.src_btn.setFixedWidth(150)
         self.src_btn.clicked.connect(lambda: self.show_language_selector('source'))
         self.src_btn.setCursor(QCursor(Qt.PointingHandCursor))
@@ -83,7 +156,7 @@ class TranslatorApp(QMainWindow):
         swap_btn.clicked.connect(self.swap_languages)
         swap_btn.setCursor(QCursor(Qt.PointingHandCursor))
 
-        self.tgt_btn = QPushButton(LANGUAGES[self.target_lang_code][self.current_interface_lang])
+        self.tgt_btn = QPushButton(language_name(self.target_lang_code, self.current_interface_lang))
         self.tgt_btn.setFixedWidth(150)
         self.tgt_btn.clicked.connect(lambda: self.show_language_selector('target'))
         self.tgt_btn.setCursor(QCursor(Qt.PointingHandCursor))
@@ -91,6 +164,12 @@ class TranslatorApp(QMainWindow):
         lang_panel.addWidget(self.src_btn)
         lang_panel.addWidget(swap_btn)
         lang_panel.addWidget(self.tgt_btn)
+
+        #one source -> several targets at once
+        self.multi_target_btn = QPushButton(UI_TRANSLATIONS[self.current_interface_lang]['multi_target'])
+        self.multi_target_btn.clicked.connect(self.show_multi_target)
+        self.multi_target_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        lang_panel.addWidget(self.multi_target_btn)
         lang_panel.addStretch()
         layout.addLayout(lang_panel)
 
@@ -158,6 +237,12 @@ class TranslatorApp(QMainWindow):
         tgt_buttons.addWidget(self.history_btn)
 
         tgt_buttons.addStretch()
+
+        #marker for results served from the translation memory
+        self.memory_label = QLabel()
+        self.memory_label.setStyleSheet('font-size: 11px; color: gray;')
+        self.memory_label.hide()
+        tgt_buttons.addWidget(self.memory_label)
         right_layout.addLayout(tgt_buttons)
 
         texts_layout.addLayout(right_layout)
@@ -167,6 +252,15 @@ class TranslatorApp(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
 
+        #rolling latency / hit rates from telemetry
+        self.telemetry_label = QLabel()
+        self.telemetry_label.setStyleSheet('font-size: 11px; color: gray; padding-right: 8px;')
+        self.telemetry_label.hide()
+        self.status_bar.addPermanentWidget(self.telemetry_label)
+        self.telemetry_timer = QTimer(self)
+        self.telemetry_timer.timeout.connect(self.update_telemetry_panel)
+        self.telemetry_timer.start(2000)
+
         self.interface_lang_label = QLabel(UI_TRANSLATIONS[self.current_interface_lang]['interface_language'])
         self.interface_lang_label.setStyleSheet('font-size: 11px; padding-right: 4px;')
         self.status_bar.addPermanentWidget(self.interface_lang_label)
@@ -204,13 +298,15 @@ class TranslatorApp(QMainWindow):
         self.update_lang_buttons()
 
         #update text button lang
-        self.src_btn.setText(LANGUAGES[self.source_lang_code][self.current_interface_lang])
-        self.tgt_btn.setText(LANGUAGES[self.target_lang_code][self.current_interface_lang])
+        self.src_btn.setText(language_name(self.source_lang_code, self.current_interface_lang))
+        self.tgt_btn.setText(language_name(self.target_lang_code, self.current_interface_lang))
+        self.multi_target_btn.setText(t['multi_target'])
+        self.update_memory_label()
+        self.update_telemetry_panel()
 
-        #update text at other langs
-        self.history_screen.update_texts()
-        self.source_lang_selector.update_texts()
-        self.target_lang_selector.update_texts()
+        #update text at other langs (only screens built so far)
+        for screen in self._screens.values():
+            screen.update_texts()
 
     def update_lang_buttons(self):
         if self.current_interface_lang == 'ru':
@@ -231,74 +327,203 @@ class TranslatorApp(QMainWindow):
         
         if previous != self.main_screen:  # workaround
             self.stack.setCurrentWidget(self.main_screen)    
-        else:
-            self.stack.setCurrentWidget(self.history_screen)
+        elif 'history' in self._screens:
+            self.stack.setCurrentWidget(self._screens['history'])
 
         self.stack.setCurrentWidget(previous)
 
     def on_source_text_changed(self):
-        self.translation_timer.start(500)
+        self.speech_prefetcher.cancel()
+        self.debounce.keystroke()
+        self.translation_timer.start(self.debounce.interval())
         self.update_speaker_buttons()
 
         if not self.source_text.toPlainText().strip():
+            self.translation_pool.cancel()
             self.target_text.clear()
+            self.memory_match = None
+            self.update_memory_label()
 
 
     def do_translation(self):
         text = self.source_text.toPlainText()
         if len(text.strip()) > 0:  # show msg if text not empty
-            if self.translation_thread and self.translation_thread.isRunning():
-                self.translation_thread.terminate()
+            started = time.perf_counter()
+            if self.source_lang_code == AUTO_DETECT:
+                #memoized and local; otherwise the previous text's language
+                #would label a cache or memory hit (the worker detects again)
+                self.detected_lang_code = self.detector.detect(text) if self.detector.ready() else None
+            #cache hit - answer right here, no network
+            cached = self.translation_cache.get(text, self.source_lang_code, self.target_lang_code)
+            if cached is not None:
+                self.translation_pool.cancel()
+                self._record_local_hit(text, 'cache', started)
+                self.on_translation_finished(cached, None)
+                return
+
+            #then exact repeats from the translation memory (history); near
+            #repeats only stand in while the request runs (suggest_from_memory)
+            match = self.memory.lookup(text, self.effective_source_lang(), self.target_lang_code, threshold=0)
+            if match is not None:
+                self.translation_pool.cancel()
+                self._record_local_hit(text, 'memory', started)
+                self.on_translation_finished(match.translated_text, None, memory_match=match)
+                return
+
+            #service is failing fast - anything close from the memory beats an error
+            if circuit_retry_after() > 0:
+                match = self.memory.lookup(
+                    text, self.effective_source_lang(), self.target_lang_code,
+                    threshold=TranslationMemory.DEGRADED_THRESHOLD,
+                )
+                if match is not None:
+                    self.translation_pool.cancel()
+                    self._record_local_hit(text, 'memory_fuzzy', started)
+                    self.on_translation_finished(match.translated_text, None, memory_match=match)
+                    return
 
             self.status_bar.showMessage(
                 UI_TRANSLATIONS[self.current_interface_lang]['translation_started'], 2000
             )
 
-            self.translation_thread = TranslatorThread(text, self.source_lang_code, self.target_lang_code)
-            self.translation_thread.finished.connect(self.on_translation_finished)
-            self.translation_thread.start()
+            #supersedes whatever is still queued or running
+            self.translation_pool.submit(text, self.source_lang_code, self.target_lang_code)
+
+    def suggest_from_memory(self, text, source_lang, target_lang):
+        #translation pool's suggest thread; exact repeats were checked already
+        match = self.memory.lookup(text, source_lang, target_lang)
+        return match if match is not None and not match.exact else None
+
+    def on_translation_suggestion(self, match, job):
+        #provisional, marked with the match percentage until the result comes
+        self.target_text.setPlainText(match.translated_text)
+        self.memory_match = match
+        self.suggested_job = job
+        self.update_memory_label()
+
+    def _record_local_hit(self, text, hit, started):
+        #network calls are recorded by the engine
+        telemetry.record(
+            'translation', hit=hit, chars=len(text.strip()),
+            source=self.effective_source_lang(), target=self.target_lang_code,
+            latency_ms=round((time.perf_counter() - started) * 1000, 1), retries=0, error=None,
+        )
+
+    def on_translation_finished(self, translated_text, exception, job=None, memory_match=None):
+        if job is not None:
+            self.debounce.latency((time.monotonic() - job.submitted_at) * 1000)
 
-    def on_translation_finished(self, translated_text, exception):
         if exception:
-            self.status_bar.showMessage(
-                UI_TRANSLATIONS[self.current_interface_lang]['translation_error'].format(str(exception)),
-                3000
-            )
-            self.target_text.setPlainText("")
+            t = UI_TRANSLATIONS[self.current_interface_lang]
+            if isinstance(exception, CircuitOpenError):
+                message = t['service_unavailable'].format(max(1, round(exception.retry_after)))
+            else:
+                message = t['translation_error'].format(str(exception))
+            self.status_bar.showMessage(message, 3000)
+            if job is None or job is not self.suggested_job:
+                self.target_text.setPlainText("")
+                self.memory_match = None
+                self.update_memory_label()
+            #else the near-repeat stays, still marked as such
+            self.suggested_job = None
             return
 
+        source_lang = self.source_lang_code
+        if job is not None:
+            self.translation_cache.put(job.text, job.source_lang, job.target_lang, translated_text)
+            if job.detected_lang:
+                source_lang = self.detected_lang_code = job.detected_lang
+            if source_lang != AUTO_DETECT:
+                self.memory.add(job.text, translated_text, source_lang, job.target_lang)
+        else:
+            source_lang = self.effective_source_lang() or self.source_lang_code
+
         self.target_text.setPlainText(translated_text)
-        self.status_bar.showMessage(
-            UI_TRANSLATIONS[self.current_interface_lang]['translation_completed'], 2000
-        )
+        self.memory_match = memory_match
+        self.suggested_job = None
+        self.update_memory_label()
+        if job is not None and job.detected_lang:
+            self.status_bar.showMessage(
+                UI_TRANSLATIONS[self.current_interface_lang]['language_detected'].format(
+                    language_name(job.detected_lang, self.current_interface_lang)
+                ), 2000
+            )
+        else:
+            self.status_bar.showMessage(
+                UI_TRANSLATIONS[self.current_interface_lang]['translation_completed'], 2000
+            )
         # Сохраняем в историю
-        self.storage.save_translation(
-            self.source_text.toPlainText(),
-            translated_text,
-            self.source_lang_code,
-            self.target_lang_code        
-        )
+        #(not memory hits: a fuzzy one is the translation of another text and
+        #would come back as an exact match for this one after a restart; not
+        #with the language still unknown, history and memory need a real one)
+        if memory_match is None and source_lang != AUTO_DETECT:
+            self.storage.save_translation(
+                self.source_text.toPlainText(),
+                translated_text,
+                source_lang,
+                self.target_lang_code
+            )
         self.update_speaker_buttons()
 
+        if self.tts_prefetch_enabled:
+            self.speech_prefetcher.prefetch(translated_text, self.target_lang_code)
+
+    def on_translation_progress(self, partial_text, job):
+        #first part of a long text, the rest is still being translated
+        self.target_text.setPlainText(partial_text)
+        self.memory_match = None
+        self.suggested_job = None
+        self.update_memory_label()
+
+    def update_telemetry_panel(self):
+        t = UI_TRANSLATIONS[self.current_interface_lang]
+        lines = []
+        for event, key in (('translation', 'telemetry_translation'), ('tts', 'telemetry_tts')):
+            summary = telemetry.summary(event)
+            if summary is None:
+                continue
+            lines.append(t[key].format(
+                summary['p50_ms'] if summary['p50_ms'] is not None else '-',
+                summary['p95_ms'] if summary['p95_ms'] is not None else '-',
+                round(summary['hit_rate'] * 100),
+            ))
+        if not lines:
+            self.telemetry_label.hide()
+            return
+        self.telemetry_label.setText(lines[0])
+        self.telemetry_label.setToolTip("\n".join(lines))
+        self.telemetry_label.show()
+
+    def update_memory_label(self):
+        match = self.memory_match
+        if match is None:
+            self.memory_label.hide()
+            return
+        t = UI_TRANSLATIONS[self.current_interface_lang]
+        if match.exact:
+            self.memory_label.setText(t['from_memory'])
+        else:
+            self.memory_label.setText(t['from_memory_fuzzy'].format(round(match.score * 100)))
+        self.memory_label.setToolTip(match.source_text)
+        self.memory_label.show()
+
+    def effective_source_lang(self):
+        #'auto' resolves to the last detected language
+        if self.source_lang_code == AUTO_DETECT:
+            return self.detected_lang_code
+        return self.source_lang_code
+
     def speak_source(self):
-        lang = self.source_lang_code        
-        speak_text(
-            self.source_text.toPlainText(),
-            lang,
-            on_status=lambda msg: self.status_bar.showMessage(
-                UI_TRANSLATIONS[self.current_interface_lang].get(msg, msg), 2000
-            )
-        )
+        self.playback.speak(self.source_text.toPlainText(), self.effective_source_lang())
 
     def speak_target(self):
-        lang = self.target_lang_code        
-        speak_text(
-            self.target_text.toPlainText(),
-            lang,
-            on_status=lambda msg: self.status_bar.showMessage(
-                UI_TRANSLATIONS[self.current_interface_lang].get(msg, msg), 2000
-            )
-        )
+        self.playback.speak(self.target_text.toPlainText(), self.target_lang_code)
+
+    def show_playback_status(self, key, detail):
+        message = UI_TRANSLATIONS[self.current_interface_lang].get(key, key)
+        if detail:
+            message = message.format(detail)
+        self.status_bar.showMessage(message, 2000)
 
     def copy_to_clipboard(self, text):
         clipboard = QApplication.clipboard()
@@ -310,6 +535,8 @@ class TranslatorApp(QMainWindow):
     def clear_source_text(self):
         self.source_text.clear()
         self.target_text.clear()
+        self.memory_match = None
+        self.update_memory_label()
         self.status_bar.showMessage(
             UI_TRANSLATIONS[self.current_interface_lang]['clear_message'], 2000
         )
@@ -319,6 +546,10 @@ class TranslatorApp(QMainWindow):
         self.history_screen.load_history()
         self.stack.setCurrentWidget(self.history_screen)
 
+    def show_multi_target(self):
+        self.multi_target_screen.run()
+        self.stack.setCurrentWidget(self.multi_target_screen)
+
     def show_language_selector(self, which):
         if which == 'source':
             self.source_lang_selector.populate_language_list(self.source_lang_code)
@@ -328,15 +559,22 @@ class TranslatorApp(QMainWindow):
             self.stack.setCurrentWidget(self.target_lang_selector)
 
     def swap_languages(self):
+        if self.source_lang_code == AUTO_DETECT:
+            if not self.detected_lang_code:
+                self.status_bar.showMessage(
+                    UI_TRANSLATIONS[self.current_interface_lang]['language_detection_failed'], 2000
+                )
+                return
+            self.source_lang_code = self.detected_lang_code
         self.source_lang_code, self.target_lang_code = self.target_lang_code, self.source_lang_code
-        self.src_btn.setText(LANGUAGES[self.source_lang_code][self.current_interface_lang])
-        self.tgt_btn.setText(LANGUAGES[self.target_lang_code][self.current_interface_lang])
+        self.src_btn.setText(language_name(self.source_lang_code, self.current_interface_lang))
+        self.tgt_btn.setText(language_name(self.target_lang_code, self.current_interface_lang))
         self.source_text.clear()
         self.target_text.clear()
         self.update_speaker_buttons()
 
     def update_speaker_buttons(self): #active or not speaker buttons
-        src_supported = self.source_lang_code in gtts_langs
+        src_supported = self.effective_source_lang() in gtts_langs
         tgt_supported = self.target_lang_code in gtts_langs
 
         src_text = self.source_text.toPlainText().strip()
@@ -363,25 +601,36 @@ class TranslatorApp(QMainWindow):
     def change_selected_language(self, which, lang_code):
         if which == 'source':
             self.source_lang_code = lang_code
-            self.src_btn.setText(LANGUAGES[lang_code][self.current_interface_lang])
+            self.src_btn.setText(language_name(lang_code, self.current_interface_lang))
         else:
             self.target_lang_code = lang_code
-            self.tgt_btn.setText(LANGUAGES[lang_code][self.current_interface_lang])
+            self.tgt_btn.setText(language_name(lang_code, self.current_interface_lang))
 
         self.stack.setCurrentWidget(self.main_screen)
         self.on_source_text_changed()
 
     def delete_history_item(self, index):
-        self.storage.delete_translation(index)
-        self.history_screen.load_history()
+        self.delete_translation(index)
 
     def clear_history(self):
         self.storage.clear_translations()
+        self.memory.clear()
         self.history_screen.load_history()
 
     def closeEvent(self, event):
+        self.translation_pool.shutdown()
+        self.playback.shutdown()
+        self.storage.close()
+        telemetry.close()
         event.accept()
 
     def delete_translation(self, index: int):
-        self.storage.delete_translation(index)
-        self.history_screen.load_history()
\ No newline at end of file
+        from ui.history_screen import EntryRole
+        #by identity: rows saved since the history was loaded shift the indexes
+        entry = self.history_screen.model.index(index).data(EntryRole)
+        if entry is None:
+            return
+        self.storage.delete_entry(entry)
+        self.memory.remove(entry['source_text'], entry['source_lang'], entry['target_lang'],
+                           entry['translated_text'])
+        self.history_screen.remove_entry(index)
\ No newline at end of file
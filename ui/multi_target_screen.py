@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit,
+    QListView, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PySide6.QtGui import QIcon, QCursor
+from PySide6.QtCore import Qt
+
+from constants import UI_TRANSLATIONS, AUTO_DETECT, language_name
+from services.telemetry import telemetry
+from services.translate import MultiTargetTranslator
+from ui.language_selector import LanguageFilterProxy, LanguageListModel
+
+
+class TargetChoiceModel(LanguageListModel):
+    #language list with a checkbox per language; `checked` keeps tick order
+    def __init__(self, checked, parent=None):
+        super().__init__(with_auto=False, parent=parent)
+        self.checked = list(checked)
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.CheckStateRole and index.isValid():
+            code = self.entries[index.row()][0]
+            return Qt.Checked if code in self.checked else Qt.Unchecked
+        return super().data(index, role)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        code = self.entries[index.row()][0]
+        if Qt.CheckState(value) == Qt.Checked:
+            if code not in self.checked:
+                self.checked.append(code)
+        elif code in self.checked:
+            self.checked.remove(code)
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+
+class MultiTargetScreen(QWidget):
+    """
+    The source text translated into several languages at once. Targets
+    are ticked on the left; each row on the right fills in as soon as its
+    language is done (cache and translation memory answer first).
+    """
+
+    DEFAULT_TARGETS = ('en', 'de', 'fr', 'es')
+
+    def __init__(self, parent):
+        super().__init__()
+        self.parent = parent  # link at TranslatorApp
+        self.rows = {}  # target code -> table row
+        self.results = {}  # target code -> translation of the current run
+        self._request = None  # (text, source lang) of the current run
+        self.translator = MultiTargetTranslator(lookup=self._lookup, parent=self)
+        self.translator.result.connect(self._on_result)
+        self._build_ui()
+
+    def _build_ui(self):
+        t = UI_TRANSLATIONS[self.parent.current_interface_lang]
+        self.layout = QVBoxLayout(self)
+
+        #top bar
+        top_bar = QHBoxLayout()
+        self.title_label = QLabel(t['multi_target_title'])
+        self.title_label.setStyleSheet("font-size: 18px; font-weight: bold;")
+        top_bar.addWidget(self.title_label)
+        top_bar.addStretch(1)
+
+        self.translate_btn = QPushButton(t['translate'])
+        self.translate_btn.clicked.connect(self.run)
+        self.translate_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        top_bar.addWidget(self.translate_btn)
+
+        close_btn = QPushButton()
+        close_btn.setIcon(QIcon("icons/close.svg"))
+        close_btn.setFixedSize(26, 26)
+        close_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        close_btn.clicked.connect(self.close_screen)
+        top_bar.addWidget(close_btn)
+        self.layout.addLayout(top_bar)
+
+        body = QHBoxLayout()
+
+        #targets: searchable list with checkboxes
+        left = QVBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText(t['search_placeholder'])
+        self.search_input.textChanged.connect(lambda text: self.proxy.set_query(text))
+        left.addWidget(self.search_input)
+
+        defaults = [code for code in self.DEFAULT_TARGETS if code != self.parent.target_lang_code]
+        self.model = TargetChoiceModel([self.parent.target_lang_code] + defaults, self)
+        self.model.set_interface_lang(self.parent.current_interface_lang)
+        self.model.dataChanged.connect(lambda *args: self.run())
+        self.proxy = LanguageFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.sort(0)
+        self.list_view = QListView()
+        self.list_view.setModel(self.proxy)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.setFixedWidth(220)
+        left.addWidget(self.list_view)
+        body.addLayout(left)
+
+        #results, one row per target
+        right = QVBoxLayout()
+        self.table = QTableWidget(0, 2)
+        self.table.horizontalHeader().hide()
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.setWordWrap(True)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.setStyleSheet("font-size: 14px;")
+        #double click copies the translation
+        self.table.cellDoubleClicked.connect(self._copy_row)
+        right.addWidget(self.table)
+
+        self.empty_label = QLabel(t['multi_target_empty'])
+        self.empty_label.setStyleSheet("color: #666; font-size: 14px;")
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        right.addWidget(self.empty_label)
+        body.addLayout(right)
+
+        self.layout.addLayout(body)
+
+    def update_texts(self):
+        t = UI_TRANSLATIONS[self.parent.current_interface_lang]
+        self.title_label.setText(t['multi_target_title'])
+        self.translate_btn.setText(t['translate'])
+        self.search_input.setPlaceholderText(t['search_placeholder'])
+        self.empty_label.setText(t['multi_target_empty'])
+        self.model.set_interface_lang(self.parent.current_interface_lang)
+        for code, row in self.rows.items():
+            self.table.item(row, 0).setText(language_name(code, self.parent.current_interface_lang))
+
+    def run(self):
+        #(re)translates the main screen's source text into every ticked language
+        t = UI_TRANSLATIONS[self.parent.current_interface_lang]
+        targets = list(self.model.checked)
+        text = self.parent.source_text.toPlainText()
+        source_lang = self.parent.source_lang_code
+        if source_lang == AUTO_DETECT:
+            #this text's language, not the last single-target job's
+            detector = self.parent.detector
+            source_lang = (detector.detect(text) if detector.ready() else None) or AUTO_DETECT
+
+        self.table.setRowCount(len(targets))
+        self.rows = {}
+        self.results = {}
+        for row, code in enumerate(targets):
+            self.rows[code] = row
+            self.table.setItem(row, 0, QTableWidgetItem(language_name(code, self.parent.current_interface_lang)))
+            self.table.setItem(row, 1, QTableWidgetItem(t['translating'] if text.strip() else ""))
+        self.empty_label.setVisible(not targets)
+        self.table.setVisible(bool(targets))
+
+        if not text.strip():
+            self.translator.cancel()
+            self._request = None
+            return
+        self._request = (text, source_lang)
+        self.translator.translate(text, source_lang, targets)
+        self.table.resizeRowsToContents()
+
+    def close_screen(self):
+        self.translator.cancel()
+        self.parent.stack.setCurrentWidget(self.parent.main_screen)
+
+    def _lookup(self, text, source_lang, target_lang):
+        cached = self.parent.translation_cache.get(text, source_lang, target_lang)
+        hit = 'cache'
+        if cached is None:
+            #exact repeats only, a near-repeat is another text's translation
+            match = self.parent.memory.lookup(text, source_lang, target_lang, threshold=0)
+            if match is None:
+                return None
+            cached, hit = match.translated_text, 'memory'
+        telemetry.record('translation', hit=hit, chars=len(text.strip()), source=source_lang,
+                         target=target_lang, latency_ms=0.0, retries=0, error=None)
+        return cached
+
+    def _on_result(self, generation, target, translated_text, error):
+        row = self.rows.get(target)
+        if row is None or self._request is None:
+            return
+        item = self.table.item(row, 1)
+        if error is not None:
+            item.setText(UI_TRANSLATIONS[self.parent.current_interface_lang]['translation_error'].format(error))
+            item.setForeground(Qt.darkRed)
+        else:
+            item.setText(translated_text)
+            self.results[target] = translated_text
+            text, source_lang = self._request
+            self.parent.translation_cache.put(text, source_lang, target, translated_text)
+        self.table.resizeRowToContents(row)
+
+    def _copy_row(self, row, column):
+        for code, code_row in self.rows.items():
+            if code_row == row and self.results.get(code):
+                self.parent.copy_to_clipboard(self.results[code])